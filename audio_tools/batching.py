@@ -0,0 +1,206 @@
+"""
+Request batching for FFmpeg operations
+Groups compatible requests that queue up behind a running FFmpeg job so
+one FFmpeg run serves the whole group
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# How long the first request queued behind a running batch waits for it to
+# finish before starting its own run; a request with nothing running for its
+# key starts at once
+BATCH_MAX_WAIT_SEC = 0.05
+
+# Largest number of requests served by one FFmpeg run
+BATCH_MAX_SIZE = 8
+
+# Input size bounds (bytes) for the batch size bands; roughly 30 s and
+# 5 min of 128 kbps audio. Inputs of similar length finish together, so a
+# short file is not held back by a long one in the same run
+_SIZE_BANDS = (480 * 1024, 4800 * 1024)
+
+BatchRunner = Callable[[List[bytes]], List[bytes]]
+
+# Runs a blocking callable off the event loop: (func, *args) -> result
+BlockingRunner = Callable[..., Awaitable]
+
+
+def size_band(input_data: bytes) -> int:
+    """
+    Get the size band of an input, used as part of a batch key
+    
+    Args:
+        input_data: Input audio data
+    
+    Returns:
+        0 for short inputs, 1 for medium, 2 for long
+    """
+    size = len(input_data)
+    return sum(size >= bound for bound in _SIZE_BANDS)
+
+
+class BatchScheduler:
+    """
+    Collects requests per key and runs each group through one batch call
+    A request is run at once when no batch with its key is running; requests
+    arriving while one is form a group, flushed when that run finishes, after
+    BATCH_MAX_WAIT_SEC, or as soon as the group holds BATCH_MAX_SIZE requests,
+    whichever comes first. The batch call runs through run_blocking
+    """
+    
+    def __init__(
+        self,
+        max_wait: float = BATCH_MAX_WAIT_SEC,
+        max_size: int = BATCH_MAX_SIZE,
+        run_blocking: BlockingRunner = run_in_threadpool
+    ):
+        """
+        Initialize the scheduler
+        
+        Args:
+            max_wait: Seconds a group queued behind a running batch waits at most
+            max_size: Requests that trigger an immediate flush
+            run_blocking: Coroutine function running a batch call off the
+                event loop (default: the threadpool)
+        """
+        self.max_wait = max_wait
+        self.max_size = max_size
+        self.run_blocking = run_blocking
+        self._pending: Dict[Hashable, Tuple[BatchRunner, List[Tuple[bytes, asyncio.Future]]]] = {}
+        # Number of batch runs in progress per key
+        self._running: Dict[Hashable, int] = {}
+        # Running batch tasks; the loop only holds weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, key: Hashable, input_data: bytes, run_batch: BatchRunner) -> bytes:
+        """
+        Queue an input and wait for its result
+        
+        Args:
+            key: Batch key; only requests with equal keys share a run
+            input_data: Input audio data
+            run_batch: Blocking callable turning a list of inputs into a list
+                of outputs in the same order; the first request's callable
+                serves the whole group
+        
+        Returns:
+            Output data for this input
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        running = key in self._running
+        group = self._pending.get(key)
+        if group is None:
+            group = (run_batch, [])
+            self._pending[key] = group
+            if running:
+                loop.call_later(self.max_wait, self._flush, key, group)
+        
+        group[1].append((input_data, future))
+        
+        # Nothing to wait for when no run with this key is in progress
+        if not running or len(group[1]) >= self.max_size:
+            self._flush(key, group)
+        
+        return await future
+    
+    def _flush(self, key: Hashable, group: Tuple[BatchRunner, List[Tuple[bytes, asyncio.Future]]]):
+        """
+        Start the batch run for a group, once
+        
+        Args:
+            key: Batch key of the group
+            group: (run_batch, [(input_data, future), ...])
+        """
+        # The timer of a group already flushed earlier finds a newer group (or none)
+        if self._pending.get(key) is not group:
+            return
+        del self._pending[key]
+        self._running[key] = self._running.get(key, 0) + 1
+        task = asyncio.ensure_future(self._run(key, *group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, key: Hashable, run_batch: BatchRunner, items: List[Tuple[bytes, asyncio.Future]]):
+        """
+        Run a group, hand each caller its result, then start the group that
+        queued up behind it
+        
+        Args:
+            key: Batch key of the group
+            run_batch: Blocking batch callable
+            items: (input_data, future) per request
+        """
+        try:
+            await self._run_items(run_batch, items)
+        finally:
+            count = self._running.pop(key) - 1
+            if count:
+                self._running[key] = count
+            
+            group = self._pending.get(key)
+            if group is not None:
+                self._flush(key, group)
+    
+    async def _run_items(self, run_batch: BatchRunner, items: List[Tuple[bytes, asyncio.Future]]):
+        """
+        Run a group's inputs through one batch call
+        If the batch run fails, each input is retried on its own so one bad
+        file only fails its own request; groups of several inputs only form
+        under load, so lone requests never pay for the retry
+        
+        Args:
+            run_batch: Blocking batch callable
+            items: (input_data, future) per request
+        """
+        inputs = [input_data for input_data, _ in items]
+        
+        try:
+            outputs = await self.run_blocking(run_batch, inputs)
+        except Exception as e:
+            if len(items) == 1:
+                self._settle(items[0][1], exception=e)
+                return
+            
+            logger.warning("Batch of %d failed (%s), retrying inputs individually", len(items), e)
+            for input_data, future in items:
+                try:
+                    output = (await self.run_blocking(run_batch, [input_data]))[0]
+                except Exception as single_error:
+                    self._settle(future, exception=single_error)
+                else:
+                    self._settle(future, result=output)
+            return
+        
+        logger.debug("Batch of %d completed", len(items))
+        for (_, future), output in zip(items, outputs):
+            self._settle(future, result=output)
+    
+    @staticmethod
+    def _settle(
+        future: asyncio.Future,
+        result: Optional[bytes] = None,
+        exception: Optional[Exception] = None
+    ):
+        """
+        Set a future's outcome unless its request has gone away
+        
+        Args:
+            future: Future a caller is waiting on
+            result: Output data
+            exception: Error to raise in the caller instead
+        """
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
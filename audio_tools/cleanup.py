@@ -4,18 +4,114 @@ Ensures resources are cleaned up after processing
 Requirements: 10.5, 11.4
 """
 
+import os
+import errno
 import tempfile
-import shutil
 import logging
+import sys
+import time
 import atexit
 import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Set, Optional
-from contextlib import contextmanager
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+from contextlib import contextmanager, nullcontext
 
 logger = logging.getLogger(__name__)
 
+# Default prefix for temporary directories; stale ones are found by prefix
+TEMP_DIR_PREFIX = "audio_toolkit_"
+
+# Upper bound on concurrent deletions; rmdir/unlink release the GIL
+DEFAULT_MAX_WORKERS = 16
+
+# Emptied directories kept per thread by pooled_temp_directory
+POOLED_DIRS_PER_THREAD = 4
+
+# Single dict set/pop calls are atomic under the GIL, so the tracking
+# dict only needs a lock on free-threaded (PEP 703) builds
+_GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Tracked directories are held open so their contents can be removed
+# relative to the directory fd (unlinkat), skipping kernel path resolution
+_HAVE_DIR_FD = (
+    hasattr(os, "O_DIRECTORY")
+    and os.scandir in os.supports_fd
+    and os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+)
+# O_NOFOLLOW makes a directory swapped for a symlink mid-walk fail with
+# ELOOP instead of being followed, the guarantee shutil.rmtree gives when
+# rmtree.avoids_symlink_attacks is True
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0)
+
+
+def _fast_rmtree(path: str):
+    """
+    Recursively delete a directory tree
+    Uses the file type cached on each DirEntry from readdir instead of an
+    extra lstat per entry; symlinks are unlinked, never followed
+    
+    Args:
+        path: Directory to delete
+    """
+    if _HAVE_DIR_FD:
+        # Walk by directory fd so a concurrent symlink swap cannot redirect
+        # the deletion outside the tree
+        dirfd = os.open(path, _DIR_OPEN_FLAGS)
+        try:
+            _rmtree_contents_at(dirfd)
+        finally:
+            os.close(dirfd)
+        os.rmdir(path)
+        return
+    
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    
+    os.rmdir(path)
+
+
+def _rmtree_contents_at(dirfd: int):
+    """
+    Recursively delete the contents of an open directory
+    Every unlink/rmdir is relative to a directory fd, so the kernel never
+    re-walks the full path; symlinks are unlinked, never followed
+    
+    Args:
+        dirfd: File descriptor of the directory to empty
+    """
+    with os.scandir(dirfd) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                childfd = os.open(entry.name, _DIR_OPEN_FLAGS, dir_fd=dirfd)
+                try:
+                    _rmtree_contents_at(childfd)
+                finally:
+                    os.close(childfd)
+                os.rmdir(entry.name, dir_fd=dirfd)
+            else:
+                os.unlink(entry.name, dir_fd=dirfd)
+
+
+# Live managers, cleaned up on program exit by a single atexit handler
+# Held weakly so discarded managers do not linger in the atexit table
+_active_managers: "weakref.WeakSet[CleanupManager]" = weakref.WeakSet()
+
+
+def _cleanup_all_managers():
+    """Clean up every live CleanupManager; registered once with atexit"""
+    for manager in list(_active_managers):
+        manager.cleanup_all()
+
+
+atexit.register(_cleanup_all_managers)
+
 
 class CleanupManager:
     """
@@ -24,15 +120,37 @@ class CleanupManager:
     Requirements: 10.5, 11.4
     """
     
-    def __init__(self):
-        """Initialize cleanup manager"""
-        self._temp_dirs: Set[Path] = set()
-        self._lock = threading.Lock()
+    # Fixed attribute layout; __weakref__ is needed for _active_managers
+    __slots__ = (
+        "_temp_dirs",
+        "_lock",
+        "max_workers",
+        "_sweeper_started",
+        "_sweeper_lock",
+        "_pool",
+        "__weakref__",
+    )
+    
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize cleanup manager
         
-        # Register cleanup on program exit
-        atexit.register(self.cleanup_all)
+        Args:
+            max_workers: Maximum number of threads used to delete directories
+        """
+        # Tracked directory path -> open directory fd (None if unavailable)
+        self._temp_dirs: Dict[str, Optional[int]] = {}
+        self._lock: Optional[threading.Lock] = None if _GIL_ENABLED else threading.Lock()
+        self.max_workers = max_workers
+        self._sweeper_started = False
+        self._sweeper_lock = threading.Lock()
+        # Per-thread stack of emptied directories (free_dirs) for reuse
+        self._pool = threading.local()
+        
+        # Cleaned up on program exit by the module-level atexit handler
+        _active_managers.add(self)
     
-    def create_temp_dir(self, prefix: str = "audio_toolkit_") -> Path:
+    def create_temp_dir(self, prefix: str = TEMP_DIR_PREFIX) -> Path:
         """
         Create a temporary directory and track it for cleanup
         
@@ -42,15 +160,23 @@ class CleanupManager:
         Returns:
             Path to temporary directory
         """
-        temp_dir = Path(tempfile.mkdtemp(prefix=prefix))
+        temp_dir = tempfile.mkdtemp(prefix=prefix)
         
-        with self._lock:
-            self._temp_dirs.add(temp_dir)
+        dirfd = None
+        if _HAVE_DIR_FD:
+            try:
+                dirfd = os.open(temp_dir, _DIR_OPEN_FLAGS)
+            except OSError as e:
+                logger.debug(f"Could not open temporary directory {temp_dir}: {e}")
+        
+        # Track plain strings; hashing a str is cheaper than hashing a Path
+        with self._lock or nullcontext():
+            self._temp_dirs[temp_dir] = dirfd
         
         logger.debug(f"Created temporary directory: {temp_dir}")
-        return temp_dir
+        return Path(temp_dir)
     
-    def cleanup_dir(self, temp_dir: Path) -> bool:
+    def cleanup_dir(self, temp_dir: Union[Path, str]) -> bool:
         """
         Clean up a specific temporary directory
         
@@ -60,36 +186,92 @@ class CleanupManager:
         Returns:
             True if cleanup successful, False otherwise
         """
+        temp_dir = os.fspath(temp_dir)
+        
+        # Take ownership of the directory fd so no other caller can use it
+        with self._lock or nullcontext():
+            dirfd = self._temp_dirs.pop(temp_dir, None)
+        
         try:
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+            # Fast path: a directory that was never written to needs a single
+            # rmdir; only walk the tree when it actually has contents
+            try:
+                os.rmdir(temp_dir)
+                logger.debug(f"Cleaned up temporary directory: {temp_dir}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                    raise
+                if dirfd is not None:
+                    _rmtree_contents_at(dirfd)
+                    os.rmdir(temp_dir)
+                else:
+                    _fast_rmtree(temp_dir)
                 logger.debug(f"Cleaned up temporary directory: {temp_dir}")
-            
-            with self._lock:
-                self._temp_dirs.discard(temp_dir)
             
             return True
             
         except Exception as e:
             logger.error(f"Failed to clean up temporary directory {temp_dir}: {e}")
+            
+            # Keep tracking the path so a later cleanup_all can retry
+            with self._lock or nullcontext():
+                self._temp_dirs.setdefault(temp_dir, None)
+            
             return False
+        
+        finally:
+            if dirfd is not None:
+                os.close(dirfd)
     
     def cleanup_all(self):
         """
         Clean up all tracked temporary directories
         Called on program exit or manually
         """
-        with self._lock:
-            temp_dirs_copy = self._temp_dirs.copy()
+        with self._lock or nullcontext():
+            temp_dirs_copy = list(self._temp_dirs)
         
         if temp_dirs_copy:
             logger.info(f"Cleaning up {len(temp_dirs_copy)} temporary directories")
             
-            for temp_dir in temp_dirs_copy:
-                self.cleanup_dir(temp_dir)
+            # Directories are independent, so delete them concurrently
+            workers = max(1, min(self.max_workers, len(temp_dirs_copy)))
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(self.cleanup_dir, temp_dirs_copy))
+            except RuntimeError:
+                # New threads are refused once the interpreter is shutting
+                # down (i.e. when called from atexit), so delete serially
+                for temp_dir in temp_dirs_copy:
+                    self.cleanup_dir(temp_dir)
+    
+    def start_background_sweeper(self, interval_sec: float = 600, max_age_hours: int = 1):
+        """
+        Start a daemon thread that periodically removes old temporary directories
+        Keeps the temp-root scan off request paths; safe to call repeatedly
+        
+        Args:
+            interval_sec: Seconds between sweeps
+            max_age_hours: Maximum age of temporary files in hours
+        """
+        with self._sweeper_lock:
+            if self._sweeper_started:
+                return
+            self._sweeper_started = True
+        
+        def sweep():
+            while True:
+                cleanup_old_temp_files(max_age_hours, self.max_workers)
+                time.sleep(interval_sec)
+        
+        thread = threading.Thread(target=sweep, name="temp-dir-sweeper", daemon=True)
+        thread.start()
+        logger.info(f"Started background temp directory sweeper (interval: {interval_sec}s)")
     
     @contextmanager
-    def temp_directory(self, prefix: str = "audio_toolkit_"):
+    def temp_directory(self, prefix: str = TEMP_DIR_PREFIX):
         """
         Context manager for temporary directory
         Ensures cleanup on both success and failure
@@ -113,6 +295,86 @@ class CleanupManager:
         finally:
             # Clean up regardless of success or failure (Requirement 10.5, 11.4)
             self.cleanup_dir(temp_dir)
+    
+    @contextmanager
+    def pooled_temp_directory(self):
+        """
+        Context manager for a reusable temporary directory
+        On exit the directory is emptied and kept for the next request on the
+        same thread, saving a mkdir/rmdir pair per short job. Pooled
+        directories stay tracked, so cleanup_all still removes them, and
+        always use TEMP_DIR_PREFIX, so the stale-dir sweep finds leaked ones;
+        a directory may serve any job, so callers get no custom prefix
+        
+        Yields:
+            Path to an empty temporary directory
+        """
+        free_dirs = getattr(self._pool, "free_dirs", None)
+        if free_dirs is None:
+            free_dirs = self._pool.free_dirs = []
+        
+        temp_dir = None
+        while free_dirs:
+            candidate = free_dirs.pop()
+            try:
+                # Refresh mtime so the stale-dir sweep leaves it alone;
+                # also fails if the directory was removed while pooled
+                os.utime(candidate)
+            except OSError:
+                self.cleanup_dir(candidate)
+                continue
+            temp_dir = Path(candidate)
+            break
+        
+        if temp_dir is None:
+            temp_dir = self.create_temp_dir()
+        
+        try:
+            yield temp_dir
+        finally:
+            path = os.fspath(temp_dir)
+            if len(free_dirs) < POOLED_DIRS_PER_THREAD and self._clear_dir(path):
+                free_dirs.append(path)
+            else:
+                # Pool is full or the directory could not be emptied
+                self.cleanup_dir(path)
+    
+    def _clear_dir(self, temp_dir: str) -> bool:
+        """
+        Remove the contents of a tracked directory, keeping the directory
+        
+        Args:
+            temp_dir: Path to temporary directory
+            
+        Returns:
+            True if the directory is tracked and now empty, False otherwise
+        """
+        # Take ownership of the tracked fd for the walk (a single pop, atomic
+        # with or without the lock) so cleanup_dir on another thread cannot
+        # close it, and the kernel reuse its number, mid-walk; -1 = untracked
+        with self._lock or nullcontext():
+            dirfd = self._temp_dirs.pop(temp_dir, -1)
+        if dirfd == -1:
+            return False
+        
+        try:
+            if dirfd is not None:
+                _rmtree_contents_at(dirfd)
+            else:
+                with os.scandir(temp_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            _fast_rmtree(entry.path)
+                        else:
+                            os.unlink(entry.path)
+            return True
+        except Exception as e:
+            logger.debug(f"Could not empty temporary directory {temp_dir}: {e}")
+            return False
+        finally:
+            # Track the directory (and its fd) again
+            with self._lock or nullcontext():
+                self._temp_dirs[temp_dir] = dirfd
 
 
 # Global cleanup manager instance
@@ -120,7 +382,7 @@ cleanup_manager = CleanupManager()
 
 
 @contextmanager
-def temporary_directory(prefix: str = "audio_toolkit_"):
+def temporary_directory(prefix: str = TEMP_DIR_PREFIX):
     """
     Convenience function for temporary directory context manager
     
@@ -140,36 +402,96 @@ def temporary_directory(prefix: str = "audio_toolkit_"):
         yield temp_dir
 
 
-def cleanup_old_temp_files(max_age_hours: int = 1):
+@contextmanager
+def pooled_temporary_directory():
+    """
+    Convenience function for the pooled temporary directory context manager
+    For short per-request jobs; see CleanupManager.pooled_temp_directory
+    
+    Yields:
+        Path to an empty temporary directory
+    """
+    with cleanup_manager.pooled_temp_directory() as temp_dir:
+        yield temp_dir
+
+
+def _remove_old_dir(path: str) -> bool:
+    """Remove a stale temporary directory, logging any failure"""
+    try:
+        _fast_rmtree(path)
+        logger.debug(f"Cleaned up old temporary directory: {path}")
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to clean up old directory {path}: {e}")
+        return False
+
+
+def cleanup_old_temp_files(max_age_hours: int = 1, max_workers: int = DEFAULT_MAX_WORKERS):
     """
     Clean up old temporary files that may have been left behind
     Useful for periodic cleanup tasks
     
     Args:
         max_age_hours: Maximum age of temporary files in hours
+        max_workers: Maximum number of threads used to delete directories
     """
-    temp_root = Path(tempfile.gettempdir())
-    cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+    temp_root = tempfile.gettempdir()
+    cutoff_ts = time.time() - max_age_hours * 3600.0
     
-    cleaned_count = 0
+    stale_dirs = []
     
     try:
         # Find all audio_toolkit_* directories in temp
-        for temp_dir in temp_root.glob("audio_toolkit_*"):
-            if not temp_dir.is_dir():
-                continue
-            
-            # Check directory age
-            try:
-                dir_mtime = datetime.fromtimestamp(temp_dir.stat().st_mtime)
+        # A plain str.startswith on each name replaces glob/fnmatch matching,
+        # and os.scandir serves type/stat from the directory entry cache, so
+        # only prefix matches cost a stat()
+        with os.scandir(temp_root) as entries:
+            for entry in entries:
+                if not entry.name.startswith(TEMP_DIR_PREFIX):
+                    continue
                 
-                if dir_mtime < cutoff_time:
-                    shutil.rmtree(temp_dir)
-                    cleaned_count += 1
-                    logger.debug(f"Cleaned up old temporary directory: {temp_dir}")
-            
-            except Exception as e:
-                logger.warning(f"Failed to clean up old directory {temp_dir}: {e}")
+                # Check directory age
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_ts:
+                        stale_dirs.append(entry.path)
+                
+                except Exception as e:
+                    logger.warning(f"Failed to clean up old directory {entry.path}: {e}")
+        
+        if not stale_dirs:
+            return
+        
+        # Move stale directories into a per-sweep trash directory (one rename
+        # each) and delete the trash in the background; the trash name keeps
+        # the audio_toolkit_ prefix so a later sweep reclaims any leftovers
+        trash_dir = tempfile.mkdtemp(prefix=f"{TEMP_DIR_PREFIX}trash_{os.getpid()}_", dir=temp_root)
+        cleaned_count = 0
+        inline_dirs = []
+        
+        for path in stale_dirs:
+            try:
+                os.rename(path, os.path.join(trash_dir, os.path.basename(path)))
+                cleaned_count += 1
+                logger.debug(f"Cleaned up old temporary directory: {path}")
+            except OSError:
+                # e.g. EXDEV; fall back to deleting in place
+                inline_dirs.append(path)
+        
+        threading.Thread(
+            target=_remove_old_dir,
+            args=(trash_dir,),
+            name="temp-dir-trash",
+            daemon=True
+        ).start()
+        
+        # Delete directories that could not be staged concurrently
+        if inline_dirs:
+            workers = max(1, min(max_workers, len(inline_dirs)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                cleaned_count += sum(executor.map(_remove_old_dir, inline_dirs))
         
         if cleaned_count > 0:
             logger.info(f"Cleaned up {cleaned_count} old temporary directories")
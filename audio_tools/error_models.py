@@ -4,10 +4,10 @@ Provides standardized error responses with user-friendly messages
 Requirements: 12.1, 9.5
 """
 
-from pydantic import BaseModel
-from typing import Optional, Dict
+from pydantic import BaseModel, ConfigDict
+from typing import Callable, Optional, Dict, Union
 from enum import Enum
-
+from functools import partial
 
 class ErrorCode(str, Enum):
     """Standard error codes for audio toolkit operations"""
@@ -45,7 +45,12 @@ class ErrorResponse(BaseModel):
         details: Detailed technical information (optional)
         suggestion: User-friendly suggestion for resolution (optional)
         code: Error code for programmatic handling
+    
+    Instances are immutable so default responses can be cached and shared;
+    code is stored as its plain string value so serialization skips the Enum path
     """
+    model_config = ConfigDict(frozen=True, use_enum_values=True)
+    
     error: str
     details: Optional[str] = None
     suggestion: Optional[str] = None
@@ -139,6 +144,72 @@ ERROR_MESSAGES: Dict[ErrorCode, Dict[str, str]] = {
 }
 
 
+# Fallback message for codes without an entry in ERROR_MESSAGES
+_DEFAULT_MESSAGE: Dict[str, str] = {
+    "error": "An error occurred",
+    "suggestion": "Please try again."
+}
+
+
+# Prebuilt responses for the common case (no details, default suggestion)
+# Safe to share because ErrorResponse is frozen; they are not pre-serialized,
+# since every handler in msc.py and router.py passes details
+_CACHED_RESPONSES: Dict[ErrorCode, ErrorResponse] = {
+    code: ErrorResponse(
+        error=message_info["error"],
+        suggestion=message_info.get("suggestion"),
+        code=code
+    )
+    for code, message_info in ERROR_MESSAGES.items()
+}
+
+
+def _emit(
+    details: Optional[str] = None,
+    *,
+    error: str,
+    suggestion: Optional[str],
+    code: ErrorCode,
+    default: ErrorResponse
+) -> ErrorResponse:
+    """
+    Build an error response from pre-bound message fields
+    
+    Args:
+        details: Optional detailed technical information
+        error: Short error description for the code
+        suggestion: Default suggestion for the code
+        code: Error code
+        default: Prebuilt response returned when there are no details
+        
+    Returns:
+        ErrorResponse object
+    """
+    if details is None:
+        return default
+    
+    return ErrorResponse(
+        error=error,
+        details=details,
+        suggestion=suggestion,
+        code=code
+    )
+
+
+# Per-code factories with message fields bound at import time
+# e.g. ERROR_FACTORIES[ErrorCode.RATE_LIMIT]("retry in 5s")
+ERROR_FACTORIES: Dict[ErrorCode, Callable[[Optional[str]], ErrorResponse]] = {
+    code: partial(
+        _emit,
+        error=message_info["error"],
+        suggestion=message_info.get("suggestion"),
+        code=code,
+        default=_CACHED_RESPONSES[code]
+    )
+    for code, message_info in ERROR_MESSAGES.items()
+}
+
+
 def create_error_response(
     code: ErrorCode,
     details: Optional[str] = None,
@@ -155,10 +226,12 @@ def create_error_response(
     Returns:
         ErrorResponse object
     """
-    message_info = ERROR_MESSAGES.get(code, {
-        "error": "An error occurred",
-        "suggestion": "Please try again."
-    })
+    if custom_suggestion is None:
+        factory = ERROR_FACTORIES.get(code)
+        if factory is not None:
+            return factory(details)
+    
+    message_info = ERROR_MESSAGES.get(code, _DEFAULT_MESSAGE)
     
     return ErrorResponse(
         error=message_info["error"],
@@ -168,14 +241,16 @@ def create_error_response(
     )
 
 
-def get_http_status(code: ErrorCode) -> int:
+def get_http_status(code: Union[ErrorCode, str]) -> int:
     """
     Get HTTP status code for error code
     
     Args:
-        code: Error code
+        code: Error code (ErrorCode member or its string value)
         
     Returns:
         HTTP status code (default: 500)
     """
+    # ErrorCode members hash and compare equal to their string values,
+    # so plain strings find the same entries
     return ERROR_STATUS_MAP.get(code, 500)
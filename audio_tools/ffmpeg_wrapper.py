@@ -5,12 +5,696 @@ Handles subprocess execution, error handling, and logging
 
 import subprocess
 import logging
+import os
 import shutil
-from typing import List, Optional
+import struct
+import sys
+import errno
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import IO, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
+from types import MappingProxyType
+
+from .cleanup import pooled_temporary_directory
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# User-facing format names -> FFmpeg muxer names for piped output (read-only)
+FFMPEG_FORMAT_MAP = MappingProxyType({
+    "mp3": "mp3",
+    "wav": "wav",
+    "flac": "flac",
+    "aac": "adts",  # AAC uses ADTS container for streaming
+    "ogg": "ogg",
+    "m4a": "mp4",  # M4A uses MP4 container with special flags for streaming
+})
+
+# Encoder thread counts; short piped jobs lose more to spawning auto-detected
+# thread pools than they gain, and LAME/Vorbis encode on a single thread anyway
+_ENCODER_THREADS: Dict[str, int] = {
+    "libmp3lame": 1,
+    "libvorbis": 1,
+    "aac": min(4, os.cpu_count() or 1),
+    "flac": os.cpu_count() or 1,
+}
+
+# Format-specific codec settings to preserve quality (Requirement 1.3),
+# prebuilt once with the encoder's -threads option appended
+_CODEC_ARGS: Dict[str, Tuple[str, ...]] = {
+    fmt: (*args, "-threads", str(_ENCODER_THREADS[args[1]])) if args[1] in _ENCODER_THREADS else args
+    for fmt, args in {
+        "mp3": ("-codec:a", "libmp3lame", "-q:a", "0"),  # VBR highest quality
+        "wav": ("-codec:a", "pcm_s16le"),  # 16-bit PCM
+        "flac": ("-codec:a", "flac", "-compression_level", "5"),  # FLAC compression
+        "aac": ("-codec:a", "aac", "-b:a", "256k"),  # AAC 256kbps
+        "ogg": ("-codec:a", "libvorbis", "-q:a", "8"),  # Vorbis quality 8
+        "m4a": ("-codec:a", "aac", "-b:a", "256k"),  # M4A with AAC
+    }.items()
+}
+
+# Copy global metadata; ID3v2.3 for MP3 compatibility
+_PRESERVE_METADATA_ARGS = ("-map_metadata", "0", "-id3v2_version", "3")
+
+# Fragmented MP4 so M4A can be written to a pipe
+_FRAGMENTED_MP4_ARGS = ("-movflags", "frag_keyframe+empty_moov")
+
+# Linux pipe buffer resize (F_SETPIPE_SZ is only exposed by fcntl from Python 3.10)
+_F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031 if sys.platform.startswith("linux") else None)
+
+# Pipe buffer size for FFmpeg stdin/stdout (default is 64 KB)
+PIPE_BUFFER_SIZE = 1 << 20
+
+# FFmpeg can write its output into an anonymous memory file opened through
+# /proc/<pid>/fd instead of a pipe (Linux only)
+_HAVE_MEMFD = hasattr(os, "memfd_create") and os.path.isdir("/proc/self/fd")
+
+# Process-wide pool for concurrent FFmpeg/ffprobe runs (merge probes, split
+# cuts); shared so parallel requests interleave instead of oversubscribing
+# the CPU. Created on first use by _ffmpeg_pool()
+_FFMPEG_POOL: Optional[ThreadPoolExecutor] = None
+_FFMPEG_POOL_LOCK = threading.Lock()
+
+# Number of trailing stderr lines kept for error reporting
+STDERR_TAIL_LINES = 64
+
+# Number of probed durations / loudness measurements remembered across calls
+DURATION_CACHE_SIZE = 32
+LOUDNESS_CACHE_SIZE = 32
+
+# Largest input measured before normalizing; the analysis pass decodes the
+# whole file a second time, so bigger inputs get single-pass loudnorm
+LOUDNORM_TWO_PASS_MAX_BYTES = 32 * 1024 * 1024
+
+# loudnorm first-pass statistics fed back as measured_* options
+_LOUDNORM_MEASURED = (
+    ("input_i", "measured_I"),
+    ("input_tp", "measured_TP"),
+    ("input_lra", "measured_LRA"),
+    ("input_thresh", "measured_thresh"),
+)
+
+
+def _ffmpeg_pool() -> ThreadPoolExecutor:
+    """
+    Get the shared FFmpeg worker pool, creating it on first use
+    Tasks must not wait on other tasks in the pool, or they can deadlock
+    
+    Returns:
+        Thread pool sized to the CPU count
+    """
+    global _FFMPEG_POOL
+    if _FFMPEG_POOL is None:
+        with _FFMPEG_POOL_LOCK:
+            if _FFMPEG_POOL is None:
+                _FFMPEG_POOL = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix="ffmpeg"
+                )
+    return _FFMPEG_POOL
+
+
+def _enlarge_pipe(pipe: Optional[IO[bytes]]):
+    """
+    Grow a pipe's kernel buffer to PIPE_BUFFER_SIZE
+    Multi-MB inputs then move in far fewer write()/read() calls and context switches
+    
+    Args:
+        pipe: Pipe file object (ignored if None or unsupported on this platform)
+    """
+    if pipe is None or fcntl is None or _F_SETPIPE_SZ is None:
+        return
+    
+    try:
+        fcntl.fcntl(pipe.fileno(), _F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+    except OSError as e:
+        # e.g. EPERM above /proc/sys/fs/pipe-max-size; keep the default size
+        logger.debug(f"Could not enlarge pipe buffer: {e}")
+
+
+def _drain_stderr(pipe: IO[bytes], tail: deque):
+    """
+    Read a process's stderr until EOF, keeping only the last lines
+    FFmpeg rewrites its progress line with carriage returns, so both \r and
+    \n end a line; memory stays bounded however long the job runs
+    
+    Args:
+        pipe: stderr pipe of the process
+        tail: Bounded deque that receives the non-empty lines
+    """
+    pending = b""
+    for chunk in iter(lambda: pipe.read(65536), b""):
+        parts = (pending + chunk).replace(b"\r", b"\n").split(b"\n")
+        # Keep any unterminated partial line, capped in case it never ends
+        pending = parts.pop()[-4096:]
+        tail.extend(line for line in parts if line.strip())
+    
+    if pending.strip():
+        tail.append(pending)
+    pipe.close()
+
+
+def _feed_stdin(pipe: IO[bytes], data: bytes):
+    """
+    Write input data to a process's stdin and close it
+    Writes pipe-buffer-sized memoryview slices, so no chunk is ever copied
+    and FFmpeg can start encoding while the rest is still being written
+    
+    Args:
+        pipe: Unbuffered stdin pipe of the process
+        data: Data to write
+    """
+    view = memoryview(data)
+    try:
+        for offset in range(0, len(view), PIPE_BUFFER_SIZE):
+            chunk = view[offset:offset + PIPE_BUFFER_SIZE]
+            # Raw writes may be partial
+            while chunk:
+                chunk = chunk[pipe.write(chunk):]
+    except BrokenPipeError:
+        # FFmpeg exited early; its stderr says why
+        pass
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+    finally:
+        view.release()
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+
+
+@contextmanager
+def _seekable_input(input_data: bytes, input_format: str, temp_dir: str) -> Iterator[str]:
+    """
+    Expose input data to FFmpeg as a seekable file
+    Uses a memfd opened through /proc/<pid>/fd where available, so the data
+    never touches the filesystem; otherwise a file in temp_dir
+    
+    Args:
+        input_data: Input audio data
+        input_format: Input audio format (file extension of the fallback file)
+        temp_dir: Directory for the fallback file
+        
+    Yields:
+        Path FFmpeg can open as its input
+    """
+    if not _HAVE_MEMFD:
+        input_path = os.path.join(temp_dir, f"input.{input_format}")
+        with open(input_path, 'wb') as f:
+            f.write(input_data)
+        yield input_path
+        return
+    
+    fd = os.memfd_create("ffmpeg_input", getattr(os, "MFD_CLOEXEC", 0))
+    try:
+        with open(fd, 'wb', closefd=False) as f:
+            f.write(input_data)
+        yield f"/proc/{os.getpid()}/fd/{fd}"
+    finally:
+        os.close(fd)
+
+
+def _thread_args(codec: str) -> Tuple[str, ...]:
+    """
+    Get the -threads option for an encoder
+    
+    Args:
+        codec: FFmpeg encoder name (e.g., "libmp3lame")
+        
+    Returns:
+        ("-threads", N) if the encoder has a tuned count, otherwise ()
+    """
+    threads = _ENCODER_THREADS.get(codec)
+    return ("-threads", str(threads)) if threads else ()
+
+
+@lru_cache(maxsize=256)
+def _build_convert_argv(
+    ffmpeg_path: str,
+    output_format: str,
+    preserve_metadata: bool
+) -> Tuple[str, ...]:
+    """
+    Build the FFmpeg argv for a format conversion
+    Pure function of its arguments, so the result is cached; copy it with
+    list() before use
+    
+    Args:
+        ffmpeg_path: Path to ffmpeg executable
+        output_format: Output format (e.g., "mp3", "wav")
+        preserve_metadata: Whether to preserve metadata
+        
+    Returns:
+        Command tuple reading from stdin and writing to stdout
+    """
+    # Metadata (if preserved), codec/quality settings, and fragmented MP4
+    # for M4A so it can be piped
+    return (
+        ffmpeg_path,
+        "-i", "pipe:0",  # Read from stdin
+        *(_PRESERVE_METADATA_ARGS if preserve_metadata else ()),
+        *_CODEC_ARGS.get(output_format, ()),
+        *(_FRAGMENTED_MP4_ARGS if output_format == "m4a" else ()),
+        "-f", FFMPEG_FORMAT_MAP.get(output_format, output_format),  # Output format (FFmpeg name)
+        "pipe:1"  # Write to stdout
+    )
+
+
+@lru_cache(maxsize=256)
+def _build_compress_argv(ffmpeg_path: str, input_format: str, bitrate: str) -> Tuple[str, ...]:
+    """
+    Build the FFmpeg argv for compressing to a target bitrate
+    Pure function of its arguments, so the result is cached; copy it with
+    list() before use
+    Requirements: 4.1, 4.2 - maintain acceptable quality at target bitrate
+    
+    Args:
+        ffmpeg_path: Path to ffmpeg executable
+        input_format: Input format
+        bitrate: Target bitrate (e.g., "320k", "192k", "128k")
+        
+    Returns:
+        Command tuple reading from stdin and writing to stdout; the FFmpeg
+        output format is the second-to-last element
+    """
+    ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(input_format, input_format)
+    
+    if input_format in ["aac", "m4a"]:
+        codec_args = ("-codec:a", "aac", "-b:a", bitrate, *_thread_args("aac"))
+    elif input_format == "ogg":
+        # For OGG, use quality-based encoding that approximates the bitrate
+        # Map bitrates to vorbis quality levels
+        quality_map = {
+            "320k": "8",  # ~320 kbps
+            "192k": "6",  # ~192 kbps
+            "128k": "4",  # ~128 kbps
+        }
+        quality = quality_map.get(bitrate, "6")
+        codec_args = ("-codec:a", "libvorbis", "-q:a", quality, *_thread_args("libvorbis"))
+    else:
+        # MP3 stays MP3; WAV/FLAC (uncompressed/lossless) and unknown
+        # formats are converted to MP3 for compression
+        codec_args = ("-codec:a", "libmp3lame", "-b:a", bitrate, *_thread_args("libmp3lame"))
+        ffmpeg_output_format = "mp3"
+    
+    return (
+        ffmpeg_path,
+        "-i", "pipe:0",  # Read from stdin
+        *codec_args,
+        # Special handling for M4A/MP4 to support piped output
+        *(_FRAGMENTED_MP4_ARGS if ffmpeg_output_format == "mp4" else ()),
+        "-f", ffmpeg_output_format,
+        "pipe:1"  # Write to stdout
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_copy_output_args(input_format: str) -> Tuple[str, ...]:
+    """
+    Build the output options of a stream-copy cut written to stdout
+    
+    Args:
+        input_format: Input audio format (also the output format)
+        
+    Returns:
+        Tuple of output arguments ending in pipe:1
+    """
+    ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(input_format, input_format)
+    return (
+        "-c", "copy",  # Copy without re-encoding for speed
+        # Piped MP4 must be fragmented, or the muxer fails on the unseekable output
+        *(_FRAGMENTED_MP4_ARGS if ffmpeg_output_format == "mp4" else ()),
+        "-f", ffmpeg_output_format,
+        "pipe:1"
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_segment_output_args(input_format: str) -> Tuple[str, ...]:
+    """
+    Build the stream-copy segment muxer options (cut points excluded)
+    
+    Args:
+        input_format: Input audio format (also the segment format)
+        
+    Returns:
+        Tuple of output arguments
+    """
+    return (
+        "-map", "0:a",
+        "-c", "copy",  # Copy without re-encoding for speed
+        "-f", "segment",
+        "-segment_format", FFMPEG_FORMAT_MAP.get(input_format, input_format),
+        "-reset_timestamps", "1",  # Each piece starts at 0
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_encode_output_args(output_format: str) -> Tuple[str, ...]:
+    """
+    Build the output options for re-encoding filtered audio to stdout
+    
+    Args:
+        output_format: Output audio format
+        
+    Returns:
+        Tuple of output arguments ending in pipe:1
+    """
+    ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(output_format, output_format)
+    return (
+        # Format's own encoder with its tuned -threads count (Requirement 1.3)
+        *_CODEC_ARGS.get(output_format, ()),
+        *(_FRAGMENTED_MP4_ARGS if ffmpeg_output_format == "mp4" else ()),
+        "-f", ffmpeg_output_format,
+        "pipe:1"
+    )
+
+
+@lru_cache(maxsize=64)
+def _atempo_chain(speed: float) -> str:
+    """
+    Build an atempo filter chain for a speed multiplier
+    Each atempo stage is kept within [0.5, 2.0], so speeds outside that range
+    are factored into 2.0 (or 0.5) stages plus one remainder stage
+    
+    Args:
+        speed: Speed multiplier
+        
+    Returns:
+        Filter string, e.g. "atempo=0.5,atempo=0.5,atempo=0.5,atempo=0.8" for 0.1
+    """
+    factors = []
+    remaining = speed
+    while remaining > 2.0:
+        factors.append(2.0)
+        remaining /= 2.0
+    while remaining < 0.5:
+        factors.append(0.5)
+        remaining /= 0.5
+    factors.append(remaining)
+    return ",".join(f"atempo={factor:g}" for factor in factors)
+
+
+# Executable name -> absolute path, shared by all callers; only successful
+# lookups are stored, so a later install is still found
+_EXECUTABLES: Dict[str, str] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    """
+    Resolve an executable on PATH, caching hits
+    Spawning FFmpeg/ffprobe then does not scan PATH on every call
+    
+    Args:
+        name: Executable name or path (e.g., "ffprobe")
+        
+    Returns:
+        Absolute path, or None if not found
+    """
+    path = _EXECUTABLES.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _EXECUTABLES[name] = path
+    return path
+
+
+def _run_probe(
+    command: List[str],
+    input_data: Optional[bytes] = None,
+    timeout: int = 10
+) -> subprocess.CompletedProcess:
+    """
+    Run a short-lived helper process (ffprobe, version check) and capture its output
+    With close_fds=False and an absolute executable path CPython launches the
+    child with posix_spawn/vfork instead of fork+exec, so startup does not pay
+    for copying the parent's page tables. Python-created fds are
+    non-inheritable (PEP 446), so nothing extra leaks into the child
+    
+    Args:
+        command: Command as list of strings
+        input_data: Optional input data to pipe to stdin
+        timeout: Command timeout in seconds
+        
+    Returns:
+        Completed process with captured stdout/stderr bytes
+    """
+    return subprocess.run(
+        command,
+        executable=_which(command[0]) or command[0],
+        input=input_data,
+        capture_output=True,
+        timeout=timeout,
+        close_fds=False
+    )
+
+
+# MPEG audio Layer III header tables (ISO 11172-3 / 13818-3)
+# Bitrates in kbps indexed by the 4-bit bitrate index; 0 (free) and 15 are invalid
+_MP3_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0)
+_MP3_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0)
+_MP3_SAMPLE_RATES_V1 = (44100, 48000, 32000)
+
+# ADTS sampling frequency index table (ISO 14496-3)
+_ADTS_SAMPLE_RATES = (
+    96000, 88200, 64000, 48000, 44100, 32000,
+    24000, 22050, 16000, 12000, 11025, 8000, 7350,
+)
+
+# Input options that cap stream analysis for short jobs and header probes
+# (FFmpeg otherwise reads up to 5 MB / 5 s of input before starting)
+# -fflags +nobuffer is deliberately absent: it drops the packets read while
+# probing, which cuts the start of stream-copied trims
+_FAST_PROBE_ARGS = (
+    "-probesize", "32768",
+    "-analyzeduration", "0",
+)
+
+# FFmpeg muxers that keep an input's cover art when the single-file path
+# writes them to stdout (see FFmpegWrapper._run_batch); the mp3 muxer picks
+# the picture but cannot write it to a pipe, so piped MP3 output has none
+_VIDEO_MUXERS = frozenset({"flac", "ogg", "mp4"})
+
+# Output formats whose raw frames can be joined without re-encoding
+_STREAM_COPY_MERGE_FORMATS = frozenset({"mp3", "aac"})
+
+# How far into the data to search for the first MP3/ADTS frame
+_SYNC_SEARCH_LIMIT = 64 * 1024
+
+
+def _probe_wav(data: bytes) -> dict:
+    """Read sample rate and bitrate from the RIFF fmt chunk, and duration from the data chunk size"""
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return {}
+    
+    info = {}
+    offset = 12
+    while offset + 8 <= len(data):
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        if chunk_id == b"fmt " and offset + 24 <= len(data):
+            sample_rate, byte_rate = struct.unpack_from("<II", data, offset + 12)
+            info = {"sample_rate": sample_rate, "bit_rate": byte_rate * 8}
+        elif chunk_id == b"data":
+            # Streamed WAVs carry a placeholder size; trust the bytes present
+            data_size = min(chunk_size, len(data) - offset - 8)
+            if info.get("bit_rate"):
+                info["duration"] = data_size * 8 / info["bit_rate"]
+            break
+        # Chunks are word aligned
+        offset += 8 + chunk_size + (chunk_size & 1)
+    
+    return info
+
+
+def _probe_mp3(data: bytes) -> dict:
+    """Read sample rate, bitrate and channel count from the first Layer III frame header"""
+    offset = 0
+    
+    # Skip an ID3v2 tag (syncsafe size, plus optional 10-byte footer)
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        offset = 10 + size + (10 if data[5] & 0x10 else 0)
+    
+    limit = min(len(data) - 4, offset + _SYNC_SEARCH_LIMIT)
+    while offset < limit:
+        offset = data.find(b"\xff", offset, limit)
+        if offset < 0:
+            return {}
+        
+        b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+        version = (b1 >> 3) & 0x3  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+        layer = (b1 >> 1) & 0x3  # 1 = Layer III
+        bitrate_index = b2 >> 4
+        rate_index = (b2 >> 2) & 0x3
+        
+        if (b1 & 0xE0) != 0xE0 or version == 1 or layer != 1 \
+                or bitrate_index in (0, 15) or rate_index == 3:
+            offset += 1
+            continue
+        
+        if version == 3:
+            bitrate_kbps = _MP3_BITRATES_V1[bitrate_index]
+            sample_rate = _MP3_SAMPLE_RATES_V1[rate_index]
+            samples_per_frame = 1152
+            side_info = 17 if (b3 >> 6) == 3 else 32
+        else:
+            bitrate_kbps = _MP3_BITRATES_V2[bitrate_index]
+            sample_rate = _MP3_SAMPLE_RATES_V1[rate_index] >> (1 if version == 2 else 2)
+            samples_per_frame = 576
+            side_info = 9 if (b3 >> 6) == 3 else 17
+        
+        bit_rate = bitrate_kbps * 1000
+        
+        # A Xing header in the first frame carries the VBR frame and byte counts
+        # (LAME writes the same frame tagged "Info" for CBR files)
+        xing = offset + 4 + side_info
+        has_info_frame = data[xing:xing + 4] in (b"Xing", b"Info")
+        if data[xing:xing + 4] == b"Xing" and len(data) >= xing + 16:
+            flags = struct.unpack_from(">I", data, xing + 4)[0]
+            if flags & 0x3 == 0x3:
+                frames, total_bytes = struct.unpack_from(">II", data, xing + 8)
+                if frames:
+                    bit_rate = total_bytes * 8 * sample_rate // (frames * samples_per_frame)
+        
+        channels = 1 if (b3 >> 6) == 3 else 2
+        
+        # A bare frame stream (no ID3v2/ID3v1 tag, no Xing/Info frame) can be
+        # byte-concatenated with others without leaving junk mid-stream
+        raw = offset == 0 and not has_info_frame and data[-128:-125] != b"TAG"
+        
+        return {"sample_rate": sample_rate, "bit_rate": bit_rate, "channels": channels, "raw": raw}
+    
+    return {}
+
+
+def _probe_flac(data: bytes) -> dict:
+    """Read sample rate and duration from the STREAMINFO block"""
+    # "fLaC", 4-byte block header, then STREAMINFO (sample rate is 20 bits at
+    # byte 10, followed by channels, bits per sample and 36-bit total samples)
+    if data[:4] != b"fLaC" or len(data) < 26 or (data[4] & 0x7F) != 0:
+        return {}
+    
+    sample_rate = (data[18] << 12) | (data[19] << 4) | (data[20] >> 4)
+    if not sample_rate:
+        return {}
+    
+    info = {"sample_rate": sample_rate}
+    total_samples = ((data[21] & 0x0F) << 32) | struct.unpack_from(">I", data, 22)[0]
+    if total_samples:  # 0 means unknown
+        info["duration"] = total_samples / sample_rate
+    return info
+
+
+def _probe_ogg(data: bytes) -> dict:
+    """Read sample rate and nominal bitrate from the Vorbis identification header"""
+    if data[:4] != b"OggS" or len(data) < 27:
+        return {}
+    
+    # The first packet starts right after the page's segment table
+    packet = 27 + data[26]
+    if data[packet:packet + 7] != b"\x01vorbis" or len(data) < packet + 24:
+        return {}
+    
+    sample_rate, _bitrate_max, bitrate_nominal = struct.unpack_from("<IiI", data, packet + 12)
+    info = {"sample_rate": sample_rate}
+    if bitrate_nominal:
+        info["bit_rate"] = bitrate_nominal
+    return info
+
+
+def _probe_adts(data: bytes) -> dict:
+    """Read sample rate and channel count from the first ADTS frame header"""
+    offset = 0
+    limit = min(len(data) - 3, _SYNC_SEARCH_LIMIT)
+    while offset < limit:
+        offset = data.find(b"\xff", offset, limit)
+        if offset < 0:
+            return {}
+        
+        # 12-bit syncword and layer bits must be zero
+        if (data[offset + 1] & 0xF6) == 0xF0:
+            rate_index = (data[offset + 2] >> 2) & 0xF
+            if rate_index < len(_ADTS_SAMPLE_RATES):
+                channels = ((data[offset + 2] & 0x1) << 2) | (data[offset + 3] >> 6)
+                return {
+                    "sample_rate": _ADTS_SAMPLE_RATES[rate_index],
+                    "channels": channels,
+                    "raw": offset == 0  # No leading tag before the first frame
+                }
+        offset += 1
+    
+    return {}
+
+
+_FAST_PROBES = {
+    "wav": _probe_wav,
+    "mp3": _probe_mp3,
+    "flac": _probe_flac,
+    "ogg": _probe_ogg,
+    "aac": _probe_adts,
+}
+
+
+def _probe_fast(data: bytes, fmt: str) -> dict:
+    """
+    Read basic stream parameters from the container/frame headers in-process
+    Avoids an ffprobe launch for formats whose headers are simple to parse
+    
+    Args:
+        data: Audio data (only the first few KB are inspected)
+        fmt: Format name (e.g., "mp3", "wav")
+        
+    Returns:
+        Dict with "sample_rate" and, where the header carries them, "bit_rate"
+        (bits per second), "channels", "duration" (seconds, WAV/FLAC) and "raw"
+        (MP3/ADTS frame stream with no tags or info frame); empty if the format
+        is unsupported or parsing fails
+    """
+    probe = _FAST_PROBES.get(fmt)
+    if probe is None:
+        return {}
+    
+    try:
+        return probe(data)
+    except (struct.error, IndexError):
+        return {}
+
+
+def _probe_version(ffmpeg_path: str) -> bool:
+    """
+    Run `ffmpeg -version`
+    Not cached, so a removed or replaced binary is noticed on the next check;
+    callers that probe often (/health) keep their own time-bounded cache
+    
+    Args:
+        ffmpeg_path: Path to ffmpeg executable
+        
+    Returns:
+        True if FFmpeg ran successfully
+        
+    Raises:
+        RuntimeError: If FFmpeg exits with a non-zero code
+    """
+    result = _run_probe([ffmpeg_path, "-version"], timeout=5)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg -version exited with code {result.returncode}")
+    return True
+
 
 class FFmpegWrapper:
     """
@@ -19,6 +703,12 @@ class FFmpegWrapper:
     Requirements: 9.4, 9.6, 12.3
     """
     
+    # blake2b digest of input data -> duration in seconds / loudnorm
+    # measurement, shared by all instances and LRU-bounded
+    _durations: "OrderedDict[bytes, float]" = OrderedDict()
+    _loudness: "OrderedDict[bytes, Dict[str, str]]" = OrderedDict()
+    _analysis_lock = threading.Lock()
+    
     def __init__(self, ffmpeg_path: str = "ffmpeg"):
         """
         Initialize FFmpeg wrapper
@@ -31,7 +721,7 @@ class FFmpegWrapper:
     
     def _check_ffmpeg(self):
         """Check if FFmpeg is available"""
-        if not shutil.which(self.ffmpeg_path):
+        if not _which(self.ffmpeg_path):
             logger.error(f"FFmpeg not found at: {self.ffmpeg_path}")
             raise RuntimeError(f"FFmpeg not found. Please install FFmpeg and ensure it's in PATH.")
         
@@ -46,13 +736,7 @@ class FFmpegWrapper:
             True if FFmpeg is available, False otherwise
         """
         try:
-            result = subprocess.run(
-                [self.ffmpeg_path, "-version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
+            return _probe_version(self.ffmpeg_path)
         except Exception as e:
             logger.error(f"FFmpeg availability check failed: {e}")
             return False
@@ -63,7 +747,8 @@ class FFmpegWrapper:
         input_data: Optional[bytes] = None,
         timeout: int = 300,
         operation: str = "processing",
-        filename: Optional[str] = None
+        filename: Optional[str] = None,
+        out_mode: str = "pipe"
     ) -> bytes:
         """
         Execute FFmpeg command with error handling and detailed logging
@@ -75,6 +760,9 @@ class FFmpegWrapper:
             timeout: Command timeout in seconds (default: 5 minutes)
             operation: Description of operation for logging (e.g., "conversion", "trimming")
             filename: Optional filename for logging context
+            out_mode: "pipe" to read output from stdout, or "memfd" to have FFmpeg
+                write into a memory file (the command's last argument, its output
+                target, is replaced); "memfd" falls back to "pipe" where unsupported
             
         Returns:
             Output data from stdout
@@ -82,27 +770,35 @@ class FFmpegWrapper:
         Raises:
             RuntimeError: If FFmpeg execution fails
         """
-        from datetime import datetime
-        import os
-        
-        # Log operation start with timestamp and file information
-        timestamp = datetime.now().isoformat()
+        # Log records carry their own timestamps; only the elapsed time is tracked here
+        start_time = time.monotonic()
+        
+        # Large outputs go to a memfd: FFmpeg writes straight into page-cache
+        # backed memory (seekable, so muxers can finalize headers) and the
+        # result is read back once, instead of streaming through a 64 KB pipe
+        out_fd = None
+        if out_mode == "memfd" and _HAVE_MEMFD:
+            out_fd = os.memfd_create("ffmpeg_output", getattr(os, "MFD_CLOEXEC", 0))
+            command = [command[0], "-y", *command[1:-1], f"/proc/{os.getpid()}/fd/{out_fd}"]
         file_info = f" (file: {filename})" if filename else ""
-        input_size = len(input_data) if input_data else 0
         
-        logger.info(
-            f"[{timestamp}] Starting FFmpeg {operation}{file_info} "
-            f"(input size: {input_size} bytes)"
-        )
-        logger.info(f"FFmpeg command: {' '.join(command)}")
+        # Skip building the command string when nobody will see it
+        if logger.isEnabledFor(logging.INFO):
+            input_size = len(input_data) if input_data else 0
+            logger.info(
+                f"Starting FFmpeg {operation}{file_info} "
+                f"(input size: {input_size} bytes)"
+            )
+            logger.info(f"FFmpeg command: {' '.join(command)}")
         
         # Log environment information for debugging GCP deployment
-        logger.debug(f"FFmpeg path: {self.ffmpeg_path}")
-        logger.debug(f"Working directory: {os.getcwd()}")
-        logger.debug(f"Environment PATH: {os.environ.get('PATH', 'Not set')}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"FFmpeg path: {self.ffmpeg_path}")
+            logger.debug(f"Working directory: {os.getcwd()}")
+            logger.debug(f"Environment PATH: {os.environ.get('PATH', 'Not set')}")
         
         # Check if FFmpeg is accessible
-        if not shutil.which(self.ffmpeg_path):
+        if not _which(self.ffmpeg_path):
             logger.error(f"FFmpeg not found in PATH: {self.ffmpeg_path}")
             raise RuntimeError(f"FFmpeg not found at {self.ffmpeg_path}")
         
@@ -110,28 +806,71 @@ class FFmpegWrapper:
             logger.debug(f"Creating subprocess for FFmpeg {operation}")
             process = subprocess.Popen(
                 command,
+                executable=_which(command[0]) or command[0],
                 stdin=subprocess.PIPE if input_data else None,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.PIPE if out_fd is None else subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
+                bufsize=0,  # Raw pipes: no BufferedReader/Writer copy layer
                 cwd=None,  # Use current working directory
-                env=None   # Use current environment
+                env=None,  # Use current environment
+                close_fds=False  # Allows posix_spawn/vfork (see _run_probe)
             )
             
+            _enlarge_pipe(process.stdin)
+            _enlarge_pipe(process.stdout)
+            
             logger.debug(f"Subprocess created (PID: {process.pid}), communicating with input data")
             
-            stdout, stderr = process.communicate(input=input_data, timeout=timeout)
+            # stderr is drained by a thread into a bounded tail instead of being
+            # buffered whole; stdin is fed by a thread while stdout is read here
+            stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+            io_threads = [
+                threading.Thread(target=_drain_stderr, args=(process.stderr, stderr_tail), daemon=True)
+            ]
+            if process.stdin is not None:
+                io_threads.append(
+                    threading.Thread(target=_feed_stdin, args=(process.stdin, input_data), daemon=True)
+                )
+            for thread in io_threads:
+                thread.start()
+            
+            # Kill the process if it overruns the timeout; reading then hits EOF
+            timed_out = threading.Event()
+            
+            def kill_on_timeout():
+                timed_out.set()
+                process.kill()
             
-            # Capture and log stderr output (Requirements: 12.3, 9.6)
-            stderr_text = stderr.decode('utf-8', errors='ignore')
+            timer = threading.Timer(timeout, kill_on_timeout)
+            timer.start()
+            try:
+                if out_fd is None:
+                    # readall() grows a single bytes object in place
+                    stdout = process.stdout.readall()
+                    process.stdout.close()
+                process.wait()
+                for thread in io_threads:
+                    thread.join()
+            finally:
+                timer.cancel()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(command, timeout)
+            
+            if out_fd is not None:
+                with open(out_fd, 'rb', closefd=False) as output_file:
+                    stdout = output_file.read()
             
             logger.debug(f"Process completed with return code: {process.returncode}")
             
             if process.returncode != 0:
-                # Log detailed error information with timestamp and file context
-                end_timestamp = datetime.now().isoformat()
+                # Capture and log stderr output (Requirements: 12.3, 9.6)
+                stderr_text = b"\n".join(stderr_tail).decode('utf-8', errors='ignore')
+                
+                # Log detailed error information with elapsed time and file context
                 logger.error(
-                    f"[{end_timestamp}] FFmpeg {operation} failed{file_info} "
-                    f"(return code: {process.returncode})"
+                    f"FFmpeg {operation} failed{file_info} "
+                    f"(return code: {process.returncode}, after {time.monotonic() - start_time:.2f}s)"
                 )
                 logger.error(f"FFmpeg command that failed: {' '.join(command)}")
                 logger.error(f"FFmpeg stderr output:\n{stderr_text}")
@@ -158,25 +897,25 @@ class FFmpegWrapper:
                     f"FFmpeg {operation} failed: {meaningful_error}"
                 )
             
-            # Log stderr even on success (FFmpeg outputs progress info to stderr)
-            if stderr_text:
+            # Log stderr even on success (FFmpeg outputs progress info to stderr);
+            # only decoded when debug logging would actually emit it
+            if stderr_tail and logger.isEnabledFor(logging.DEBUG):
+                stderr_text = b"\n".join(stderr_tail).decode('utf-8', errors='ignore')
                 logger.debug(f"FFmpeg stderr output (success):\n{stderr_text}")
             
-            # Log successful completion with timestamp and output size
-            end_timestamp = datetime.now().isoformat()
-            output_size = len(stdout)
-            logger.info(
-                f"[{end_timestamp}] FFmpeg {operation} completed successfully{file_info} "
-                f"(output size: {output_size} bytes)"
-            )
+            # Log successful completion with elapsed time and output size
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"FFmpeg {operation} completed successfully{file_info} "
+                    f"(output size: {len(stdout)} bytes, {time.monotonic() - start_time:.2f}s)"
+                )
             
             return stdout
             
         except subprocess.TimeoutExpired:
             process.kill()
-            end_timestamp = datetime.now().isoformat()
             logger.error(
-                f"[{end_timestamp}] FFmpeg {operation} timed out{file_info} "
+                f"FFmpeg {operation} timed out{file_info} "
                 f"(timeout: {timeout}s)"
             )
             logger.error(f"Command that timed out: {' '.join(command)}")
@@ -187,13 +926,17 @@ class FFmpegWrapper:
             raise
         
         except Exception as e:
-            end_timestamp = datetime.now().isoformat()
             logger.error(
-                f"[{end_timestamp}] FFmpeg {operation} execution error{file_info}: {str(e)}"
+                f"FFmpeg {operation} execution error{file_info} "
+                f"(after {time.monotonic() - start_time:.2f}s): {str(e)}"
             )
             logger.error(f"Command that caused error: {' '.join(command)}")
             logger.error(f"Exception type: {type(e).__name__}")
             raise RuntimeError(f"FFmpeg execution failed: {str(e)}")
+        
+        finally:
+            if out_fd is not None:
+                os.close(out_fd)
     
     def convert_format(
         self,
@@ -216,47 +959,36 @@ class FFmpegWrapper:
             Converted audio data
         """
         # Map user-friendly format names to FFmpeg format names
-        # Some formats need special handling for piped output
-        ffmpeg_format_map = {
-            "mp3": "mp3",
-            "wav": "wav",
-            "flac": "flac",
-            "aac": "adts",  # AAC uses ADTS container for streaming
-            "ogg": "ogg",
-            "m4a": "mp4",  # M4A uses MP4 container with special flags for streaming
-        }
-        
-        ffmpeg_output_format = ffmpeg_format_map.get(output_format, output_format)
-        
-        # Build FFmpeg command for format conversion
-        command = [
-            self.ffmpeg_path,
-            "-i", "pipe:0",  # Read from stdin
-        ]
-        
-        # Preserve metadata if requested (copy all metadata streams)
-        if preserve_metadata:
-            command.extend([
-                "-map_metadata", "0",  # Copy global metadata
-                "-id3v2_version", "3",  # Use ID3v2.3 for MP3 compatibility
-            ])
-        
-        # Format-specific codec and quality settings
-        # Maintain high quality during conversion
-        codec_settings = self._get_codec_settings(output_format)
-        command.extend(codec_settings)
+        ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(output_format, output_format)
         
-        # Special handling for M4A/MP4 to support piped output
-        if output_format == "m4a":
-            command.extend([
-                "-movflags", "frag_keyframe+empty_moov",  # Enable fragmented MP4 for streaming
-            ])
+        # Same-format "conversion" needs no decode/encode round-trip
+        if input_format == output_format:
+            if preserve_metadata:
+                logger.info(f"Input is already {output_format}, returning it unchanged")
+                return input_data
+            
+            # Only the metadata has to go: remux with stream copy
+            command = [
+                self.ffmpeg_path,
+                "-i", "pipe:0",
+                "-map", "0:a",
+                "-c", "copy",
+                "-map_metadata", "-1",  # Drop global metadata
+            ]
+            if output_format == "m4a":
+                command.extend(_FRAGMENTED_MP4_ARGS)
+            command.extend(["-f", ffmpeg_output_format, "pipe:1"])
+            
+            logger.info(f"Stripping metadata from {output_format} with stream copy")
+            return self._execute_command(
+                command,
+                input_data,
+                operation="metadata strip",
+                filename=f"input.{input_format}"
+            )
         
-        # Output format
-        command.extend([
-            "-f", ffmpeg_output_format,  # Output format (FFmpeg name)
-            "pipe:1"  # Write to stdout
-        ])
+        # Build FFmpeg command for format conversion (cached per format/options)
+        command = list(_build_convert_argv(self.ffmpeg_path, output_format, preserve_metadata))
         
         logger.info(f"Converting {input_format} to {output_format} (FFmpeg format: {ffmpeg_output_format}, preserve_metadata={preserve_metadata})")
         return self._execute_command(
@@ -266,7 +998,49 @@ class FFmpegWrapper:
             filename=f"input.{input_format}"
         )
     
-    def _get_codec_settings(self, output_format: str) -> List[str]:
+    def convert_batch(
+        self,
+        inputs: List[bytes],
+        input_format: str,
+        output_format: str,
+        preserve_metadata: bool = True
+    ) -> List[bytes]:
+        """
+        Convert several inputs of the same format with one FFmpeg run
+        Each input is mapped to its own output, so process startup and
+        encoder initialization are paid once for the batch
+        
+        Args:
+            inputs: Input audio data, one entry per file
+            input_format: Input format shared by every input
+            output_format: Output format
+            preserve_metadata: Whether to preserve metadata
+            
+        Returns:
+            Converted audio data, in the order of inputs
+        """
+        if len(inputs) < 2 or input_format == output_format:
+            return [
+                self.convert_format(input_data, input_format, output_format, preserve_metadata)
+                for input_data in inputs
+            ]
+        
+        # The cached single-file argv minus its input and output targets
+        output_args = _build_convert_argv(self.ffmpeg_path, output_format, False)[3:-1]
+        
+        logger.info(f"Converting {len(inputs)} {input_format} files to {output_format} in one FFmpeg run")
+        return self._run_batch(
+            inputs,
+            input_format,
+            [
+                # Metadata, when preserved, comes from each output's own input
+                (*(("-map_metadata", str(i), *_PRESERVE_METADATA_ARGS[2:]) if preserve_metadata else ()), *output_args)
+                for i in range(len(inputs))
+            ],
+            operation="batch format conversion"
+        )
+    
+    def _get_codec_settings(self, output_format: str) -> Tuple[str, ...]:
         """
         Get codec settings for output format to maintain quality
         Requirements: 1.3
@@ -275,21 +1049,9 @@ class FFmpegWrapper:
             output_format: Output format
             
         Returns:
-            List of FFmpeg arguments for codec settings
+            Tuple of FFmpeg arguments for codec settings (shared, do not mutate)
         """
-        # Format-specific codec settings to preserve quality
-        codec_map = {
-            "mp3": ["-codec:a", "libmp3lame", "-q:a", "0"],  # VBR highest quality
-            "wav": ["-codec:a", "pcm_s16le"],  # 16-bit PCM
-            "flac": ["-codec:a", "flac", "-compression_level", "5"],  # FLAC compression
-            "aac": ["-codec:a", "aac", "-b:a", "256k"],  # AAC 256kbps
-            "ogg": ["-codec:a", "libvorbis", "-q:a", "8"],  # Vorbis quality 8
-            "m4a": ["-codec:a", "aac", "-b:a", "256k"],  # M4A with AAC
-        }
-        
-        settings = codec_map.get(output_format, [])
-        logger.debug(f"Codec settings for {output_format}: {settings}")
-        return settings
+        return _CODEC_ARGS.get(output_format, ())
     
     def trim_audio(
         self,
@@ -331,21 +1093,13 @@ class FFmpegWrapper:
             raise ValueError(f"start_time must be >= 0, got {start_time}")
         
         # Map user-friendly format names to FFmpeg format names for piped I/O
-        ffmpeg_format_map = {
-            "mp3": "mp3",
-            "wav": "wav",
-            "flac": "flac",
-            "aac": "adts",  # AAC uses ADTS container for streaming
-            "ogg": "ogg",
-            "m4a": "mp4",  # M4A uses MP4 container
-        }
-        
-        ffmpeg_output_format = ffmpeg_format_map.get(input_format, input_format)
+        ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(input_format, input_format)
         logger.debug(f"FFmpeg output format: {ffmpeg_output_format}")
         
         # First, try with codec copy for efficiency
         command_copy = [
             self.ffmpeg_path,
+            *_FAST_PROBE_ARGS,  # Limit input analysis; trimming needs no stream stats
             "-i", "pipe:0",  # Read from stdin
             "-ss", str(start_time),  # Start time
             "-t", str(duration),  # Duration
@@ -361,7 +1115,8 @@ class FFmpegWrapper:
         
         command_copy.append("pipe:1")  # Write to stdout
         
-        logger.debug(f"Attempting trim with codec copy: {' '.join(command_copy)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Attempting trim with codec copy: {' '.join(command_copy)}")
         
         try:
             # Try codec copy first (faster, maintains quality)
@@ -378,6 +1133,7 @@ class FFmpegWrapper:
             # Fallback: re-encode the audio (slower but more compatible)
             command_reencode = [
                 self.ffmpeg_path,
+                *_FAST_PROBE_ARGS,
                 "-i", "pipe:0",  # Read from stdin
                 "-ss", str(start_time),  # Start time
                 "-t", str(duration),  # Duration
@@ -428,7 +1184,8 @@ class FFmpegWrapper:
             
             command_reencode.append("pipe:1")  # Write to stdout
             
-            logger.debug(f"Attempting trim with re-encoding: {' '.join(command_reencode)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Attempting trim with re-encoding: {' '.join(command_reencode)}")
             
             return self._execute_command(
                 command_reencode, 
@@ -460,9 +1217,6 @@ class FFmpegWrapper:
             - Implements sample rate unification to highest sample rate (Requirement 3.4)
             - Preserves order of input files (Requirement 3.1)
         """
-        import os
-        from .cleanup import temporary_directory
-        
         logger.info(f"Merging {len(input_files)} audio files to {output_format}")
         
         if len(input_files) != len(input_formats):
@@ -472,157 +1226,148 @@ class FFmpegWrapper:
             raise ValueError("At least 2 files required for merging")
         
         # Map user-friendly format names to FFmpeg format names for output
-        ffmpeg_format_map = {
-            "mp3": "mp3",
-            "wav": "wav",
-            "flac": "flac",
-            "aac": "adts",
-            "ogg": "ogg",
-            "m4a": "mp4",
-        }
-        
-        ffmpeg_output_format = ffmpeg_format_map.get(output_format, output_format)
+        ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(output_format, output_format)
         
         # Use cleanup manager for automatic cleanup (Requirements: 10.5, 11.4)
-        with temporary_directory(prefix="audio_merge_") as temp_dir:
+        with pooled_temporary_directory() as temp_dir:
             try:
                 # Step 1: Probe all input files to get their sample rates
                 # This is needed for sample rate unification (Requirement 3.4)
-                sample_rates = []
+                sample_rates: List[Optional[int]] = [None] * len(input_files)
+                # (sample_rate, channels) read from headers; None once any file lacks them
+                stream_params = set()
+                # Whether every input is a bare MP3/ADTS frame stream
+                raw_streams = True
                 
                 for i, (file_data, file_format) in enumerate(zip(input_files, input_formats)):
-                    probe_command = [
-                        "ffprobe",
-                        "-v", "error",
-                        "-select_streams", "a:0",
-                        "-show_entries", "stream=sample_rate",
-                        "-of", "default=noprint_wrappers=1:nokey=1",
-                        "-i", "pipe:0"
-                    ]
-                    
-                    probe_result = subprocess.run(
-                        probe_command,
-                        input=file_data,
-                        capture_output=True,
-                        timeout=10
+                    # Read the rate from the file header when possible; ffprobe only on failure
+                    header_info = _probe_fast(file_data, file_format)
+                    sample_rate = header_info.get("sample_rate")
+                    raw_streams = raw_streams and header_info.get("raw", False)
+                    if stream_params is not None:
+                        if sample_rate and header_info.get("channels"):
+                            stream_params.add((sample_rate, header_info["channels"]))
+                        else:
+                            stream_params = None
+                    if sample_rate:
+                        sample_rates[i] = sample_rate
+                        logger.debug(f"File {i} ({file_format}): sample rate = {sample_rate} Hz (header)")
+                
+                # Remaining files need ffprobe; the probes are independent, so run them concurrently
+                pending = [i for i, sample_rate in enumerate(sample_rates) if sample_rate is None]
+                if pending:
+                    probed = _ffmpeg_pool().map(
+                        lambda i: self._probe_sample_rate(i, input_files[i], input_formats[i]),
+                        pending
                     )
-                    
-                    if probe_result.returncode == 0:
-                        try:
-                            sample_rate = int(probe_result.stdout.decode().strip())
-                            sample_rates.append(sample_rate)
-                            logger.debug(f"File {i} ({file_format}): sample rate = {sample_rate} Hz")
-                        except (ValueError, AttributeError):
-                            # Default to 44100 if we can't determine sample rate
-                            sample_rates.append(44100)
-                            logger.warning(f"Could not determine sample rate for file {i}, using default 44100 Hz")
-                    else:
-                        # Default to 44100 if probe fails
-                        sample_rates.append(44100)
-                        logger.warning(f"Probe failed for file {i}, using default sample rate 44100 Hz")
+                    for i, sample_rate in zip(pending, probed):
+                        sample_rates[i] = sample_rate
                 
                 # Determine the maximum sample rate for unification (Requirement 3.4)
                 max_sample_rate = max(sample_rates) if sample_rates else 44100
                 logger.info(f"Unified sample rate: {max_sample_rate} Hz")
                 
-                # Step 2: Create temporary files for intermediate processing
-                # FFmpeg's concat demuxer requires files on disk
-                temp_files = []
-                concat_list_path = os.path.join(temp_dir, "concat_list.txt")
+                # Step 2: Write each input to disk once
+                # A single FFmpeg run reads every file as its own input
+                input_paths = []
                 
-                # Step 3: Convert all files to a common intermediate format with unified sample rate
-                # This handles both format conversion (Requirement 3.3) and sample rate unification (Requirement 3.4)
                 for i, (file_data, file_format) in enumerate(zip(input_files, input_formats)):
-                    # Create temporary file for this input
-                    temp_file_path = os.path.join(temp_dir, f"input_{i}.wav")
-                    temp_files.append(temp_file_path)
+                    input_path = os.path.join(temp_dir, f"input_{i}.{file_format}")
+                    with open(input_path, 'wb') as f:
+                        f.write(file_data)
+                    input_paths.append(input_path)
+                
+                # Fast path: inputs already share the output codec, sample rate and
+                # channel layout, so their frames can be joined without re-encoding
+                # (no decode, no generation loss)
+                if (
+                    output_format in _STREAM_COPY_MERGE_FORMATS
+                    and all(file_format == output_format for file_format in input_formats)
+                    and stream_params is not None
+                    and len(stream_params) == 1
+                ):
+                    if raw_streams:
+                        # Bare frame streams concatenate byte-wise: the concat
+                        # protocol reads them as one stream, no list file needed
+                        input_args = ["-i", "concat:" + "|".join(input_paths)]
+                    else:
+                        # Tags/info frames must be dropped per file: concat demuxer
+                        concat_list_path = os.path.join(temp_dir, "concat_list.txt")
+                        with open(concat_list_path, 'w') as f:
+                            for input_path in input_paths:
+                                f.write(f"file '{os.path.abspath(input_path)}'\n")
+                        input_args = [
+                            "-f", "concat",  # Use concat demuxer
+                            "-safe", "0",  # Allow absolute paths
+                            "-i", concat_list_path,
+                        ]
                     
-                    # Convert to WAV with unified sample rate as intermediate format
-                    # WAV is lossless and works well as intermediate format
-                    convert_command = [
+                    copy_command = [
                         self.ffmpeg_path,
-                        "-i", "pipe:0",  # Read from stdin
-                        "-ar", str(max_sample_rate),  # Resample to unified sample rate
-                        "-ac", "2",  # Stereo (or mono if source is mono, FFmpeg handles this)
-                        "-f", "wav",  # Output as WAV
-                        temp_file_path
+                        *input_args,
+                        "-map", "0:a",
+                        "-c", "copy",  # Copy frames (no re-encoding)
+                        "-f", ffmpeg_output_format,
+                        "pipe:1"
                     ]
                     
-                    logger.debug(f"Converting file {i} to intermediate format with sample rate {max_sample_rate} Hz")
+                    logger.debug(f"Concatenating {len(input_paths)} {output_format} files with stream copy")
                     
-                    process = subprocess.Popen(
-                        convert_command,
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE
+                    merged_output = self._execute_command(
+                        copy_command,
+                        operation="audio merge (stream copy)",
+                        filename=f"{len(input_paths)} files",
+                        out_mode="memfd"
                     )
                     
-                    stdout, stderr = process.communicate(input=file_data, timeout=300)
-                    
-                    if process.returncode != 0:
-                        error_msg = stderr.decode('utf-8', errors='ignore')
-                        logger.error(f"Failed to convert file {i}: {error_msg}")
-                        raise RuntimeError(f"Failed to convert file {i} for merging: {error_msg}")
+                    logger.info(f"Merge complete (output format: {output_format}, stream copy)")
+                    return merged_output
                 
-                # Step 4: Create concat list file for FFmpeg
-                # Format: file 'path' (one per line)
-                with open(concat_list_path, 'w') as f:
-                    for temp_file in temp_files:
-                        # Use absolute paths and escape single quotes
-                        abs_path = os.path.abspath(temp_file)
-                        f.write(f"file '{abs_path}'\n")
+                # Step 3: Build one filter graph that unifies every input and concatenates them
+                # aformat resamples each stream to the unified rate and stereo inside the graph,
+                # replacing the per-file WAV conversions (Requirements: 3.3, 3.4)
+                # Input order is the concat order (Requirement 3.1)
+                num_inputs = len(input_paths)
+                filter_graph = "".join(
+                    f"[{i}:a]aformat=sample_rates={max_sample_rate}:channel_layouts=stereo[a{i}];"
+                    for i in range(num_inputs)
+                )
+                filter_graph += "".join(f"[a{i}]" for i in range(num_inputs))
+                filter_graph += f"concat=n={num_inputs}:v=0:a=1[out]"
                 
-                logger.debug(f"Created concat list with {len(temp_files)} files")
+                concat_command = [self.ffmpeg_path]
+                for input_path in input_paths:
+                    concat_command.extend(["-i", input_path])
                 
-                # Step 5: Concatenate all files using FFmpeg's concat demuxer
-                # This preserves the order of files (Requirement 3.1)
-                concat_command = [
-                    self.ffmpeg_path,
-                    "-f", "concat",  # Use concat demuxer
-                    "-safe", "0",  # Allow absolute paths
-                    "-i", concat_list_path,  # Input is the concat list
-                ]
+                concat_command.extend([
+                    "-filter_complex", filter_graph,
+                    "-map", "[out]",
+                ])
                 
-                # For WAV output, we can use codec copy for efficiency
-                # For other formats, we need to re-encode
-                if output_format == "wav":
-                    concat_command.extend([
-                        "-c", "copy",  # Copy codec (no re-encoding for concat)
-                        "-f", "wav",  # Output as WAV
-                        "pipe:1"  # Write to stdout
-                    ])
-                else:
-                    # Re-encode to ensure proper format
-                    # Add codec settings for output format
-                    codec_settings = self._get_codec_settings(output_format)
-                    concat_command.extend(codec_settings)
-                    
-                    # Special handling for M4A/MP4 to support piped output
-                    if output_format == "m4a":
-                        concat_command.extend([
-                            "-movflags", "frag_keyframe+empty_moov",
-                        ])
-                    
+                # Add codec settings for output format
+                codec_settings = self._get_codec_settings(output_format)
+                concat_command.extend(codec_settings)
+                
+                # Special handling for M4A/MP4 to support piped output
+                if output_format == "m4a":
                     concat_command.extend([
-                        "-f", ffmpeg_output_format,
-                        "pipe:1"
+                        "-movflags", "frag_keyframe+empty_moov",
                     ])
                 
-                logger.debug("Concatenating files")
+                concat_command.extend([
+                    "-f", ffmpeg_output_format,
+                    "pipe:1"
+                ])
+                
+                logger.debug(f"Concatenating {num_inputs} files in a single FFmpeg pass")
                 
-                concat_result = subprocess.run(
+                merged_output = self._execute_command(
                     concat_command,
-                    capture_output=True,
-                    timeout=300
+                    operation="audio merge",
+                    filename=f"{num_inputs} files",
+                    out_mode="memfd"  # Merged output (often PCM) can be large
                 )
                 
-                if concat_result.returncode != 0:
-                    error_msg = concat_result.stderr.decode('utf-8', errors='ignore')
-                    logger.error(f"Concatenation failed: {error_msg}")
-                    raise RuntimeError(f"Audio concatenation failed: {error_msg}")
-                
-                merged_output = concat_result.stdout
-                
                 logger.info(f"Merge complete (output format: {output_format})")
                 return merged_output
                 
@@ -634,6 +1379,44 @@ class FFmpegWrapper:
                 raise RuntimeError(f"Audio merge failed: {str(e)}")
         # Temporary directory is automatically cleaned up here (Requirements: 10.5, 11.4)
     
+    def _probe_sample_rate(self, index: int, file_data: bytes, file_format: str) -> int:
+        """
+        Get the sample rate of one merge input with ffprobe
+        
+        Args:
+            index: Position of the file in the merge (for logging)
+            file_data: Input audio data
+            file_format: Input format
+            
+        Returns:
+            Sample rate in Hz (44100 if it cannot be determined)
+        """
+        probe_command = [
+            "ffprobe",
+            "-v", "error",
+            *_FAST_PROBE_ARGS,
+            "-select_streams", "a:0",
+            "-show_entries", "stream=sample_rate",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            "-i", "pipe:0"
+        ]
+        
+        probe_result = _run_probe(probe_command, file_data)
+        
+        if probe_result.returncode == 0:
+            try:
+                sample_rate = int(probe_result.stdout.decode().strip())
+                logger.debug(f"File {index} ({file_format}): sample rate = {sample_rate} Hz")
+                return sample_rate
+            except (ValueError, AttributeError):
+                # Default to 44100 if we can't determine sample rate
+                logger.warning(f"Could not determine sample rate for file {index}, using default 44100 Hz")
+                return 44100
+        
+        # Default to 44100 if probe fails
+        logger.warning(f"Probe failed for file {index}, using default sample rate 44100 Hz")
+        return 44100
+    
     def compress_audio(
         self,
         input_data: bytes,
@@ -658,37 +1441,69 @@ class FFmpegWrapper:
         """
         logger.info(f"Compressing audio to {bitrate}")
         
+        # Steps 1-2: Return the original if it is already at or below the target
+        if self._bypasses_compression(input_data, input_format, bitrate):
+            return input_data
+        
+        # Step 3: Build FFmpeg command for compression (cached per format/bitrate)
+        command = list(_build_compress_argv(self.ffmpeg_path, input_format, bitrate))
+        ffmpeg_output_format = command[-2]
+        
+        logger.info(f"Compressing {input_format} to {bitrate} (output format: {ffmpeg_output_format})")
+        return self._execute_command(
+            command,
+            input_data,
+            operation="audio compression",
+            filename=f"input.{input_format}"
+        )
+    
+    def _bypasses_compression(self, input_data: bytes, input_format: str, bitrate: str) -> bool:
+        """
+        Check whether the input is already at or below the target bitrate
+        Requirements: 4.6
+        
+        Args:
+            input_data: Input audio data
+            input_format: Input format
+            bitrate: Target bitrate (e.g., "320k", "192k", "128k")
+            
+        Returns:
+            True if the original file should be returned without reprocessing
+        """
         # Step 1: Probe the input file to get its current bitrate
         # This is needed for bypass logic (Requirement 4.6)
-        probe_command = [
-            "ffprobe",
-            "-v", "error",
-            "-select_streams", "a:0",
-            "-show_entries", "stream=bit_rate",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            "-i", "pipe:0"
-        ]
-        
         try:
-            probe_result = subprocess.run(
-                probe_command,
-                input=input_data,
-                capture_output=True,
-                timeout=10
-            )
-            
             current_bitrate = None
-            if probe_result.returncode == 0:
-                try:
-                    # Bitrate is in bits per second, convert to kbps
-                    current_bitrate_bps = int(probe_result.stdout.decode().strip())
-                    current_bitrate_kbps = current_bitrate_bps // 1000
-                    current_bitrate = current_bitrate_kbps
-                    logger.info(f"Current bitrate: {current_bitrate} kbps")
-                except (ValueError, AttributeError):
-                    logger.warning("Could not determine current bitrate, proceeding with compression")
+            
+            # Read the bitrate from the file header when possible; ffprobe only on failure
+            header_bitrate_bps = _probe_fast(input_data, input_format).get("bit_rate")
+            if header_bitrate_bps:
+                current_bitrate = header_bitrate_bps // 1000
+                logger.info(f"Current bitrate: {current_bitrate} kbps (header)")
             else:
-                logger.warning("Bitrate probe failed, proceeding with compression")
+                probe_command = [
+                    "ffprobe",
+                    "-v", "error",
+                    *_FAST_PROBE_ARGS,
+                    "-select_streams", "a:0",
+                    "-show_entries", "stream=bit_rate",
+                    "-of", "default=noprint_wrappers=1:nokey=1",
+                    "-i", "pipe:0"
+                ]
+                
+                probe_result = _run_probe(probe_command, input_data)
+                
+                if probe_result.returncode == 0:
+                    try:
+                        # Bitrate is in bits per second, convert to kbps
+                        current_bitrate_bps = int(probe_result.stdout.decode().strip())
+                        current_bitrate_kbps = current_bitrate_bps // 1000
+                        current_bitrate = current_bitrate_kbps
+                        logger.info(f"Current bitrate: {current_bitrate} kbps")
+                    except (ValueError, AttributeError):
+                        logger.warning("Could not determine current bitrate, proceeding with compression")
+                else:
+                    logger.warning("Bitrate probe failed, proceeding with compression")
             
             # Step 2: Check if bypass is needed (Requirement 4.6)
             # If current bitrate is at or below target, return original file
@@ -698,99 +1513,105 @@ class FFmpegWrapper:
                 
                 if current_bitrate <= target_bitrate_kbps:
                     logger.info(f"Current bitrate ({current_bitrate} kbps) is at or below target ({target_bitrate_kbps} kbps), bypassing compression")
-                    return input_data
+                    return True
         
         except Exception as e:
             logger.warning(f"Bitrate check failed: {e}, proceeding with compression")
         
-        # Step 3: Build FFmpeg command for compression
-        # Map user-friendly format names to FFmpeg format names
-        ffmpeg_format_map = {
-            "mp3": "mp3",
-            "wav": "wav",
-            "flac": "flac",
-            "aac": "adts",
-            "ogg": "ogg",
-            "m4a": "mp4",
-        }
-        
-        ffmpeg_output_format = ffmpeg_format_map.get(input_format, input_format)
+        return False
+    
+    def compress_batch(
+        self,
+        inputs: List[bytes],
+        input_format: str,
+        bitrate: str
+    ) -> List[bytes]:
+        """
+        Compress several inputs of the same format with one FFmpeg run
+        Inputs already at or below the target bitrate are returned unchanged
+        (Requirement 4.6); the rest share a single FFmpeg process
         
-        command = [
-            self.ffmpeg_path,
-            "-i", "pipe:0",  # Read from stdin
+        Args:
+            inputs: Input audio data, one entry per file
+            input_format: Input format shared by every input
+            bitrate: Target bitrate (e.g., "320k", "192k", "128k")
+            
+        Returns:
+            Compressed audio data, in the order of inputs
+        """
+        results = list(inputs)
+        pending = [
+            i for i, input_data in enumerate(inputs)
+            if not self._bypasses_compression(input_data, input_format, bitrate)
         ]
         
-        # Format-specific compression settings
-        # Requirements: 4.1, 4.2 - maintain acceptable quality at target bitrate
-        if input_format == "mp3":
-            command.extend([
-                "-codec:a", "libmp3lame",
-                "-b:a", bitrate,  # Target bitrate
-            ])
-        elif input_format == "wav":
-            # WAV is uncompressed, convert to MP3 for compression
-            command.extend([
-                "-codec:a", "libmp3lame",
-                "-b:a", bitrate,
-            ])
-            ffmpeg_output_format = "mp3"
-            logger.info("Converting WAV to MP3 for compression")
-        elif input_format == "flac":
-            # FLAC is lossless, convert to MP3 for compression
-            command.extend([
-                "-codec:a", "libmp3lame",
-                "-b:a", bitrate,
-            ])
-            ffmpeg_output_format = "mp3"
-            logger.info("Converting FLAC to MP3 for compression")
-        elif input_format in ["aac", "m4a"]:
-            command.extend([
-                "-codec:a", "aac",
-                "-b:a", bitrate,
-            ])
-        elif input_format == "ogg":
-            # For OGG, use quality-based encoding that approximates the bitrate
-            # Map bitrates to vorbis quality levels
-            quality_map = {
-                "320k": "8",  # ~320 kbps
-                "192k": "6",  # ~192 kbps
-                "128k": "4",  # ~128 kbps
-            }
-            quality = quality_map.get(bitrate, "6")
-            command.extend([
-                "-codec:a", "libvorbis",
-                "-q:a", quality,
-            ])
-        else:
-            # Default to MP3 compression for unknown formats
-            command.extend([
-                "-codec:a", "libmp3lame",
-                "-b:a", bitrate,
-            ])
-            ffmpeg_output_format = "mp3"
-            logger.info(f"Converting {input_format} to MP3 for compression")
-        
-        # Special handling for M4A/MP4 to support piped output
-        if input_format == "m4a" or (input_format in ["wav", "flac"] and ffmpeg_output_format == "mp3"):
-            if ffmpeg_output_format == "mp4":
-                command.extend([
-                    "-movflags", "frag_keyframe+empty_moov",
-                ])
+        if len(pending) == 1:
+            results[pending[0]] = self.compress_audio(inputs[pending[0]], input_format, bitrate)
+        elif pending:
+            # The cached single-file argv minus its input and output targets
+            output_args = _build_compress_argv(self.ffmpeg_path, input_format, bitrate)[3:-1]
+            
+            logger.info(f"Compressing {len(pending)} {input_format} files to {bitrate} in one FFmpeg run")
+            compressed = self._run_batch(
+                [inputs[i] for i in pending],
+                input_format,
+                [output_args] * len(pending),
+                operation="batch audio compression"
+            )
+            for i, output_data in zip(pending, compressed):
+                results[i] = output_data
         
-        # Output format
-        command.extend([
-            "-f", ffmpeg_output_format,
-            "pipe:1"  # Write to stdout
-        ])
+        return results
+    
+    def _run_batch(
+        self,
+        inputs: List[bytes],
+        input_format: str,
+        output_args: List[Tuple[str, ...]],
+        operation: str
+    ) -> List[bytes]:
+        """
+        Run one FFmpeg with an output per input
+        Output i takes the streams FFmpeg's automatic selection would pick
+        from input i on its own, so an output does not depend on which other
+        requests share the run: its first audio stream and, for muxers in
+        _VIDEO_MUXERS, its first video stream (cover art) if there is one
         
-        logger.info(f"Compressing {input_format} to {bitrate} (output format: {ffmpeg_output_format})")
-        return self._execute_command(
-            command,
-            input_data,
-            operation="audio compression",
-            filename=f"input.{input_format}"
-        )
+        Args:
+            inputs: Input audio data, one entry per file
+            input_format: Input format shared by every input
+            output_args: Output options (ending with -f) per input
+            operation: Description of operation for logging
+            
+        Returns:
+            Output data, in the order of inputs
+        """
+        # Use cleanup manager for automatic cleanup (Requirements: 10.5, 11.4)
+        with pooled_temporary_directory() as temp_dir:
+            command = [self.ffmpeg_path, "-y"]
+            for i, input_data in enumerate(inputs):
+                input_path = os.path.join(temp_dir, f"input_{i}.{input_format}")
+                with open(input_path, 'wb') as f:
+                    f.write(input_data)
+                command.extend(["-i", input_path])
+            
+            output_paths = []
+            for i, args in enumerate(output_args):
+                output_paths.append(os.path.join(temp_dir, f"output_{i}"))
+                video_map = ("-map", f"{i}:v:0?") if args[-1] in _VIDEO_MUXERS else ()
+                command.extend([*video_map, "-map", f"{i}:a:0", *args, output_paths[-1]])
+            
+            self._execute_command(
+                command,
+                operation=operation,
+                filename=f"{len(inputs)} files"
+            )
+            
+            outputs = []
+            for output_path in output_paths:
+                with open(output_path, 'rb') as f:
+                    outputs.append(f.read())
+            return outputs
     
     def extract_audio(
         self,
@@ -816,22 +1637,14 @@ class FFmpegWrapper:
         logger.info(f"Extracting audio from {input_format} video to {output_format} audio")
         
         # Map user-friendly format names to FFmpeg format names for output
-        ffmpeg_format_map = {
-            "mp3": "mp3",
-            "wav": "wav",
-            "flac": "flac",
-            "aac": "adts",  # AAC uses ADTS container for streaming
-            "ogg": "ogg",
-            "m4a": "mp4",  # M4A uses MP4 container
-        }
-        
-        ffmpeg_output_format = ffmpeg_format_map.get(output_format, output_format)
+        ffmpeg_output_format = FFMPEG_FORMAT_MAP.get(output_format, output_format)
         
         # Step 1: Probe the video to check if it has an audio track
         # This handles Requirement 5.6 - detect videos with no audio track
         probe_command = [
             "ffprobe",
             "-v", "error",
+            *_FAST_PROBE_ARGS,
             "-select_streams", "a:0",  # Select first audio stream
             "-show_entries", "stream=codec_type",
             "-of", "default=noprint_wrappers=1:nokey=1",
@@ -839,11 +1652,9 @@ class FFmpegWrapper:
         ]
         
         try:
-            probe_result = subprocess.run(
+            probe_result = _run_probe(
                 probe_command,
-                input=input_data,
-                capture_output=True,
-                timeout=10
+                input_data
             )
             
             # Check if audio stream was found
@@ -910,70 +1721,104 @@ class FFmpegWrapper:
                 raise RuntimeError("Failed to extract audio: video may not contain a valid audio track")
             raise
 
-    def split_audio_by_time(
-        self,
-        input_data: bytes,
-        input_format: str,
-        interval_seconds: int
-    ) -> List[bytes]:
+    def _get_duration(self, input_data: bytes) -> float:
         """
-        Split audio into equal time intervals
+        Get the duration of audio data, probing only on a cache miss
+        Repeated splits of the same upload skip the ffprobe cascade entirely
         
         Args:
             input_data: Input audio data
-            input_format: Input audio format
-            interval_seconds: Duration of each segment in seconds
             
         Returns:
-            List of audio segment data
+            Duration in seconds
+            
+        Raises:
+            RuntimeError: If the duration cannot be determined
         """
-        logger.info(f"Splitting {input_format} audio into {interval_seconds}s intervals")
+        return self._memoize(
+            self._durations,
+            DURATION_CACHE_SIZE,
+            input_data,
+            lambda: self._probe_duration(input_data)
+        )
+    
+    @classmethod
+    def _memoize(cls, cache: OrderedDict, max_size: int, input_data: bytes, compute):
+        """
+        Look up a per-input analysis result in a class-level LRU cache
+        
+        Args:
+            cache: Cache keyed by blake2b digest of the input data
+            max_size: Maximum number of entries kept
+            input_data: Input audio data the result describes
+            compute: Callable producing the result on a miss; failures raise
+                and are therefore never cached
+            
+        Returns:
+            Cached or freshly computed result
+        """
+        key = hashlib.blake2b(input_data, digest_size=16).digest()
+        with cls._analysis_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                logger.debug(f"Analysis cache hit: {value}")
+                return value
+        
+        value = compute()
+        
+        with cls._analysis_lock:
+            cache[key] = value
+            if len(cache) > max_size:
+                cache.popitem(last=False)
+        return value
+    
+    def _probe_duration(self, input_data: bytes) -> float:
+        """
+        Determine the duration of audio data with ffprobe, falling back to
+        a packet scan and finally a full FFmpeg decode
         
-        # First, get the total duration
+        Args:
+            input_data: Input audio data
+            
+        Returns:
+            Duration in seconds
+            
+        Raises:
+            RuntimeError: If every method fails
+        """
+        # Container and audio stream durations come back from a single probe
         probe_command = [
             "ffprobe",
             "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
+            "-select_streams", "a:0",
+            "-show_entries", "format=duration:stream=duration",
+            "-of", "json",
             "-i", "pipe:0"
         ]
         
         try:
-            probe_result = subprocess.run(
+            probe_result = _run_probe(
                 probe_command,
-                input=input_data,
-                capture_output=True,
-                timeout=10
+                input_data
             )
             
             if probe_result.returncode != 0:
                 raise RuntimeError("Failed to probe audio duration")
             
-            duration_str = probe_result.stdout.decode().strip()
+            probe_info = json.loads(probe_result.stdout or b"{}")
+            duration_str = probe_info.get("format", {}).get("duration", "")
             logger.info(f"Raw duration output: '{duration_str}'")
             
             # Handle 'N/A' or empty output
             if duration_str == 'N/A' or not duration_str:
-                # Try alternative method using stream info
-                alt_probe_command = [
-                    "ffprobe",
-                    "-v", "error",
-                    "-select_streams", "a:0",
-                    "-show_entries", "stream=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1",
-                    "-i", "pipe:0"
-                ]
-                
-                alt_probe_result = subprocess.run(
-                    alt_probe_command,
-                    input=input_data,
-                    capture_output=True,
-                    timeout=10
+                # Fall back to the stream duration from the same probe
+                duration_str = next(
+                    (stream["duration"] for stream in probe_info.get("streams", [])
+                     if stream.get("duration", "N/A") != "N/A"),
+                    ""
                 )
-                
-                if alt_probe_result.returncode == 0:
-                    duration_str = alt_probe_result.stdout.decode().strip()
-                    logger.info(f"Alternative duration output: '{duration_str}'")
+                logger.info(f"Alternative duration output: '{duration_str}'")
                 
                 # If still N/A, try decoding method as last resort
                 if duration_str == 'N/A' or not duration_str:
@@ -988,10 +1833,9 @@ class FFmpegWrapper:
                         "-i", "pipe:0"
                     ]
                     
-                    decode_result = subprocess.run(
+                    decode_result = _run_probe(
                         decode_probe_command,
-                        input=input_data,
-                        capture_output=True,
+                        input_data,
                         timeout=30  # Longer timeout for decode
                     )
                     
@@ -1001,6 +1845,7 @@ class FFmpegWrapper:
                         if lines and lines[-1]:
                             try:
                                 duration = float(lines[-1])
+                                duration_str = lines[-1]
                                 logger.info(f"Duration from decode method: {duration} seconds")
                             except ValueError:
                                 duration_str = 'N/A'
@@ -1010,34 +1855,32 @@ class FFmpegWrapper:
                         logger.info("Using ffmpeg decode fallback for duration")
                         fallback_command = [
                             self.ffmpeg_path,
+                            "-v", "error",
+                            "-nostats",
                             "-i", "pipe:0",
                             "-f", "null",
-                            "-v", "error",
-                            "-stats",
+                            "-progress", "pipe:1",  # Machine-readable key=value progress
                             "-"
                         ]
                         
-                        fallback_result = subprocess.run(
+                        fallback_result = _run_probe(
                             fallback_command,
-                            input=input_data,
-                            capture_output=True,
+                            input_data,
                             timeout=30
                         )
                         
-                        # Parse duration from ffmpeg stats output
+                        # The last out_time_us in the progress output is the decoded duration
                         if fallback_result.returncode == 0:
-                            stderr_output = fallback_result.stderr.decode('utf-8')
-                            # Look for time= pattern in stderr
-                            import re
-                            time_match = re.search(r'time=(\d+):(\d+):(\d+\.\d+)', stderr_output)
-                            if time_match:
-                                hours, minutes, seconds = time_match.groups()
-                                duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
-                                logger.info(f"Duration from ffmpeg stats: {duration} seconds")
+                            _, found, progress_tail = fallback_result.stdout.rpartition(b"out_time_us=")
+                            if found:
+                                duration = int(progress_tail.split(b"\n", 1)[0]) / 1_000_000
+                                logger.info(f"Duration from ffmpeg progress: {duration} seconds")
                             else:
                                 raise ValueError(f"Could not determine duration from any method")
                         else:
                             raise ValueError(f"All duration detection methods failed")
+                else:
+                    duration = float(duration_str)
             else:
                 duration = float(duration_str)
                 
@@ -1047,45 +1890,45 @@ class FFmpegWrapper:
             logger.error(f"Duration probe failed: {e}")
             raise RuntimeError("Failed to determine audio duration")
         
+        return duration
+    
+    def split_audio_by_time(
+        self,
+        input_data: bytes,
+        input_format: str,
+        interval_seconds: int
+    ) -> List[bytes]:
+        """
+        Split audio into equal time intervals
+        
+        Args:
+            input_data: Input audio data
+            input_format: Input audio format
+            interval_seconds: Duration of each segment in seconds
+            
+        Returns:
+            List of audio segment data
+        """
+        logger.info(f"Splitting {input_format} audio into {interval_seconds}s intervals")
+        
+        # First, get the total duration; WAV/FLAC headers state it directly
+        duration = _probe_fast(input_data, input_format).get("duration") or self._get_duration(input_data)
+        
         # Calculate number of segments
         num_segments = int(duration / interval_seconds) + (1 if duration % interval_seconds > 0 else 0)
         logger.info(f"Creating {num_segments} segments")
         
-        segments = []
-        for i in range(num_segments):
-            start_time = i * interval_seconds
-            end_time = min((i + 1) * interval_seconds, duration)
-            
-            # Map format for FFmpeg output compatibility
-            output_format = input_format
-            if input_format == "m4a":
-                output_format = "mp4"  # FFmpeg uses mp4 for m4a output
-            elif input_format == "mp4":
-                output_format = "mp4"
-            
-            command = [
-                self.ffmpeg_path,
-                "-i", "pipe:0",
-                "-ss", str(start_time),
-                "-t", str(end_time - start_time),
-                "-c", "copy",  # Copy without re-encoding for speed
-                "-f", output_format,
-                "pipe:1"
-            ]
-            
-            try:
-                segment_data = self._execute_command(
-                    command,
-                    input_data,
-                    operation=f"split segment {i+1}",
-                    filename=f"segment_{i+1}.{input_format}"
-                )
-                segments.append(segment_data)
-                logger.debug(f"Segment {i+1} created: {len(segment_data)} bytes")
-                
-            except RuntimeError as e:
-                logger.error(f"Failed to create segment {i+1}: {e}")
-                raise RuntimeError(f"Failed to create segment {i+1}: {str(e)}")
+        # One FFmpeg pass cuts every segment with the segment muxer
+        # Cut points come from the probed duration, which also bounds the
+        # output so trailing encoder padding does not become an extra piece
+        cut_points = [i * interval_seconds for i in range(1, num_segments)]
+        segments = self._run_segment_muxer(
+            input_data,
+            input_format,
+            ["-t", str(duration), "-segment_times", ",".join(str(t) for t in cut_points)]
+        ) if num_segments else []
+        if len(segments) != num_segments:
+            logger.warning(f"Segment muxer produced {len(segments)} segments, expected {num_segments}")
         
         logger.info(f"Split complete: {len(segments)} segments created")
         return segments
@@ -1109,7 +1952,7 @@ class FFmpegWrapper:
         """
         logger.info(f"Splitting {input_format} audio into {len(segments)} custom segments")
         
-        segment_files = []
+        ranges = []
         for i, segment in enumerate(segments):
             start_time = segment['start']
             end_time = segment['end']
@@ -1119,39 +1962,152 @@ class FFmpegWrapper:
                 logger.warning(f"Skipping invalid segment {i+1}: duration {duration}s")
                 continue
             
-            # Map format for FFmpeg output compatibility
-            output_format = input_format
-            if input_format == "m4a":
-                output_format = "mp4"  # FFmpeg uses mp4 for m4a output
-            elif input_format == "mp4":
-                output_format = "mp4"
+            name = segment.get('name', f'segment_{i+1}')
+            ranges.append((f"'{name}'", name, start_time, duration))
+        
+        # Non-overlapping ranges can all be cut in one pass: sort them by start,
+        # split at every range boundary and keep the pieces that start a range
+        by_start = sorted(range(len(ranges)), key=lambda i: ranges[i][2])
+        disjoint = all(
+            ranges[prev][2] + ranges[prev][3] <= ranges[cur][2]
+            for prev, cur in zip(by_start, by_start[1:])
+        )
+        if ranges and disjoint:
+            cut_points = []
+            range_pieces = [0] * len(ranges)
+            for i in by_start:
+                _, _, start_time, duration = ranges[i]
+                if start_time > 0 and (not cut_points or cut_points[-1] != start_time):
+                    cut_points.append(start_time)
+                range_pieces[i] = len(cut_points)
+                cut_points.append(start_time + duration)
+            
+            pieces = self._run_segment_muxer(
+                input_data,
+                input_format,
+                ["-segment_times", ",".join(str(t) for t in cut_points)]
+            )
+            # Back to the requested order
+            segment_files = [pieces[i] if i < len(pieces) else b"" for i in range_pieces]
+        else:
+            # Overlapping ranges share input, so each gets its own stream-copy cut
+            segment_files = self._extract_segments(input_data, input_format, ranges)
+        
+        logger.info(f"Split complete: {len(segment_files)} segments created")
+        return segment_files
+    
+    def _run_segment_muxer(
+        self,
+        input_data: bytes,
+        input_format: str,
+        segment_args: List[str]
+    ) -> List[bytes]:
+        """
+        Cut the input into consecutive pieces with a single FFmpeg run
+        The segment muxer writes every piece in one pass over the input, so
+        the data is piped once instead of once per segment
+        
+        Args:
+            input_data: Input audio data
+            input_format: Input audio format
+            segment_args: Output options choosing the cut points
+                (-segment_times, optionally bounded with -t)
             
+        Returns:
+            List of audio segment data, in time order
+        """
+        # Use cleanup manager for automatic cleanup (Requirements: 10.5, 11.4)
+        with pooled_temporary_directory() as temp_dir, \
+                _seekable_input(input_data, input_format, temp_dir) as input_path:
+            # A seekable input lets the demuxer use the container index
+            # (and read MP4s whose moov atom comes last)
             command = [
                 self.ffmpeg_path,
-                "-i", "pipe:0",
-                "-ss", str(start_time),
+                "-i", input_path,
+                *_build_segment_output_args(input_format),
+                *segment_args,
+                os.path.join(temp_dir, f"segment_%05d.{input_format}")
+            ]
+            
+            try:
+                self._execute_command(
+                    command,
+                    operation="split",
+                    filename=f"input.{input_format}"
+                )
+            except RuntimeError as e:
+                logger.error(f"Failed to split audio: {e}")
+                raise RuntimeError(f"Failed to create segments: {str(e)}")
+            
+            segments = []
+            for entry in sorted(os.listdir(temp_dir)):
+                if not entry.startswith("segment_"):
+                    continue
+                with open(os.path.join(temp_dir, entry), 'rb') as f:
+                    segments.append(f.read())
+                logger.debug(f"Segment {len(segments)} created: {len(segments[-1])} bytes")
+            
+            return segments
+    
+    def _extract_segments(
+        self,
+        input_data: bytes,
+        input_format: str,
+        ranges: List[Tuple[str, str, float, float]]
+    ) -> List[bytes]:
+        """
+        Cut time ranges out of the input by stream copy, one FFmpeg per range
+        The input is made a seekable file once and every FFmpeg seeks into
+        it with -ss before -i instead of reading it from the start over a
+        pipe; the ranges are independent, so they run concurrently on the
+        shared FFmpeg pool and results keep range order
+        
+        Args:
+            input_data: Input audio data
+            input_format: Input audio format
+            ranges: (label, filename stem, start, duration) per segment, in seconds
+            
+        Returns:
+            List of audio segment data, in the order of ranges
+        """
+        # Map format for FFmpeg output compatibility
+        output_args = _build_copy_output_args(input_format)
+        
+        def extract(input_path: str, segment_range: Tuple[str, str, float, float]) -> bytes:
+            label, stem, start_time, duration = segment_range
+            command = [
+                self.ffmpeg_path,
+                "-ss", str(start_time),  # Input seek via the container index
+                "-i", input_path,
                 "-t", str(duration),
-                "-c", "copy",  # Copy without re-encoding for speed
-                "-f", output_format,
-                "pipe:1"
+                *output_args
             ]
             
             try:
                 segment_data = self._execute_command(
                     command,
-                    input_data,
-                    operation=f"split segment {segment.get('name', f'segment_{i+1}')}",
-                    filename=f"{segment.get('name', f'segment_{i+1}')}.{input_format}"
+                    operation=f"split segment {label}",
+                    filename=f"{stem}.{input_format}"
                 )
-                segment_files.append(segment_data)
-                logger.debug(f"Segment '{segment.get('name', f'segment_{i+1}')}' created: {len(segment_data)} bytes")
-                
             except RuntimeError as e:
-                logger.error(f"Failed to create segment '{segment.get('name', f'segment_{i+1}')}': {e}")
-                raise RuntimeError(f"Failed to create segment '{segment.get('name', f'segment_{i+1}')}': {str(e)}")
+                logger.error(f"Failed to create segment {label}: {e}")
+                raise RuntimeError(f"Failed to create segment {label}: {str(e)}")
+            
+            logger.debug(f"Segment {label} created: {len(segment_data)} bytes")
+            return segment_data
         
-        logger.info(f"Split complete: {len(segment_files)} segments created")
-        return segment_files
+        if not ranges:
+            return []
+        
+        # Use cleanup manager for automatic cleanup (Requirements: 10.5, 11.4)
+        with pooled_temporary_directory() as temp_dir, \
+                _seekable_input(input_data, input_format, temp_dir) as input_path:
+            futures = [
+                _ffmpeg_pool().submit(extract, input_path, segment_range) for segment_range in ranges
+            ]
+            # Every cut must finish before the input is released, even if one fails
+            wait(futures)
+            return [future.result() for future in futures]
 
     def adjust_volume(
         self,
@@ -1178,6 +2134,12 @@ class FFmpegWrapper:
         """
         logger.info(f"Adjusting volume: mode={adjustment_mode}")
         
+        # Unity gain needs no FFmpeg run at all
+        if (adjustment_mode == "percentage" and volume_percentage == 100) or \
+                (adjustment_mode == "decibels" and decibel_change == 0):
+            logger.info("Volume unchanged, returning input unchanged")
+            return input_data
+        
         command = [
             self.ffmpeg_path,
             "-i", "pipe:0"
@@ -1194,15 +2156,26 @@ class FFmpegWrapper:
             logger.info(f"Volume adjustment: {decibel_change:+.1f} dB")
             
         elif adjustment_mode == "normalize":
-            # Use loudnorm filter for normalization
-            command.extend(["-af", f"loudnorm=I={normalize_target}"])
+            # Use loudnorm filter for normalization; with the input's measured
+            # loudness it applies a single linear gain instead of dynamic
+            # normalization (the measurement is cached per input and runs
+            # inside the caller's FFmpeg concurrency slot)
+            loudnorm = f"loudnorm=I={normalize_target}"
+            measured = self._get_loudness(input_data, input_format)
+            if measured:
+                loudnorm += "".join(
+                    f":{option}={measured[stat]}" for stat, option in _LOUDNORM_MEASURED
+                ) + ":linear=true:print_format=summary"
+            # loudnorm always outputs 192 kHz; go back to the input's rate
+            sample_rate = _probe_fast(input_data, input_format).get("sample_rate")
+            if sample_rate:
+                loudnorm += f",aresample={sample_rate}"
+            command.extend(["-af", loudnorm])
             logger.info(f"Volume normalization: target {normalize_target} dB")
         
-        command.extend([
-            "-c:a", "libmp3lame" if input_format == "mp3" else "copy",
-            "-f", input_format,
-            "pipe:1"
-        ])
+        # The volume filter needs decoded audio, so stream copy is impossible;
+        # re-encode with the format's own encoder (lossless for WAV/FLAC)
+        command.extend(_build_encode_output_args(input_format))
         
         try:
             return self._execute_command(
@@ -1215,6 +2188,76 @@ class FFmpegWrapper:
             logger.error(f"Volume adjustment failed: {e}")
             raise RuntimeError(f"Volume adjustment failed: {str(e)}")
 
+    def _get_loudness(self, input_data: bytes, input_format: str) -> Dict[str, str]:
+        """
+        Measure integrated loudness, true peak and loudness range with a
+        loudnorm analysis pass, caching the result per input
+        
+        Args:
+            input_data: Input audio data
+            input_format: Input audio format
+            
+        Returns:
+            loudnorm statistics (input_i, input_tp, input_lra, input_thresh),
+            or empty dict if the input is too large to decode twice or the
+            measurement failed or is unusable (e.g. silence)
+        """
+        if len(input_data) > LOUDNORM_TWO_PASS_MAX_BYTES:
+            logger.info(
+                f"Input exceeds {LOUDNORM_TWO_PASS_MAX_BYTES} bytes, using single-pass loudnorm"
+            )
+            return {}
+        
+        try:
+            return self._memoize(
+                self._loudness,
+                LOUDNESS_CACHE_SIZE,
+                input_data,
+                lambda: self._measure_loudness(input_data, input_format)
+            )
+        except (RuntimeError, ValueError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Loudness measurement failed, using single-pass loudnorm: {e}")
+            return {}
+    
+    def _measure_loudness(self, input_data: bytes, input_format: str) -> Dict[str, str]:
+        """
+        Run the loudnorm analysis pass
+        
+        Args:
+            input_data: Input audio data
+            input_format: Input audio format
+            
+        Returns:
+            loudnorm statistics keyed by their print_format=json names
+            
+        Raises:
+            RuntimeError: If FFmpeg fails
+            ValueError: If the statistics are missing or not finite
+        """
+        command = [
+            self.ffmpeg_path,
+            "-hide_banner",
+            "-nostats",
+            "-i", "pipe:0",
+            "-af", "loudnorm=print_format=json",
+            "-f", "null",
+            "-"
+        ]
+        result = _run_probe(command, input_data, timeout=300)
+        if result.returncode != 0:
+            raise RuntimeError(f"loudnorm analysis of {input_format} input failed")
+        
+        # The statistics are the last JSON object on stderr
+        stderr_text = result.stderr.decode('utf-8', errors='ignore')
+        stats = json.loads(stderr_text[stderr_text.rindex("{"):stderr_text.rindex("}") + 1])
+        measured = {stat: stats[stat] for stat, _ in _LOUDNORM_MEASURED}
+        for value in measured.values():
+            if not math.isfinite(float(value)):
+                raise ValueError(f"Unusable loudness statistic: {value}")
+        
+        logger.info(f"Measured loudness: {measured}")
+        return measured
+    
     def change_speed(
         self,
         input_data: bytes,
@@ -1236,6 +2279,11 @@ class FFmpegWrapper:
         """
         logger.info(f"Changing speed: {speed}x, preserve_pitch={preserve_pitch}")
         
+        # Normal speed needs no FFmpeg run at all
+        if speed == 1.0:
+            logger.info("Speed unchanged, returning input unchanged")
+            return input_data
+        
         command = [
             self.ffmpeg_path,
             "-i", "pipe:0"
@@ -1243,25 +2291,13 @@ class FFmpegWrapper:
         
         if preserve_pitch:
             # Use atempo filter to change speed while preserving pitch
-            # atempo has limits, so we may need to chain multiple filters
-            if speed <= 0.5:
-                # For very slow speeds, chain multiple atempo filters
-                command.extend(["-af", f"atempo=0.5,atempo={speed/0.5}"])
-            elif speed >= 2.0:
-                # For very fast speeds, chain multiple atempo filters
-                command.extend(["-af", f"atempo=2.0,atempo={speed/2.0}"])
-            else:
-                command.extend(["-af", f"atempo={speed}"])
+            command.extend(["-af", _atempo_chain(speed)])
         else:
             # Use asetrate to change speed without preserving pitch (chipmunk effect)
             # First get the original sample rate, then multiply by speed
             command.extend(["-af", f"asetrate=44100*{speed},aresample=44100"])
         
-        command.extend([
-            "-c:a", "libmp3lame" if input_format == "mp3" else "aac",
-            "-f", input_format,
-            "pipe:1"
-        ])
+        command.extend(_build_encode_output_args(input_format))
         
         try:
             return self._execute_command(
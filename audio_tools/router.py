@@ -4,18 +4,106 @@ Provides endpoints for format conversion, trimming, merging, compression, and ex
 """
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
-from fastapi.responses import StreamingResponse, JSONResponse
-from typing import List, Literal
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+from types import MappingProxyType
+from typing import Final, Iterator, List, Literal, Mapping, Optional, Tuple, get_args
+from functools import lru_cache, partial
+from pathlib import Path
+import asyncio
 import logging
 import io
+import os
+import threading
+import time
+import weakref
+import zipfile
+from urllib.parse import quote
 
+try:
+    import mutagen
+except ImportError:  # optional; header parsing covers WAV/FLAC/MP3/OGG without it
+    mutagen = None
+
+try:
+    import orjson
+except ImportError:  # optional fast path; stdlib json used otherwise
+    orjson = None
+
+from .batching import BatchScheduler, size_band
 from .error_models import ErrorResponse, ErrorCode, create_error_response, get_http_status
+from .ffmpeg_wrapper import FFmpegWrapper, _probe_fast
+from .validators import InputValidator
 
 logger = logging.getLogger(__name__)
 
 # Create router for audio tools
 router = APIRouter(prefix="/api", tags=["audio-tools"])
 
+# Uploads are read in chunks of this size so the size limit is checked as they arrive
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Audio formats accepted as outputs; FastAPI validates form values against it
+AudioFormat = Literal["mp3", "wav", "flac", "aac", "ogg", "m4a"]
+
+# MIME type per audio format, read-only
+_MIME_TYPES: Final[Mapping[str, str]] = MappingProxyType({
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "flac": "audio/flac",
+    "aac": "audio/aac",
+    "ogg": "audio/ogg",
+    "m4a": "audio/mp4"
+})
+
+# Every output format and every accepted input format (outputs of trim,
+# volume and speed keep the input format) has a MIME type, so lookups index
+# the table directly
+if not set(get_args(AudioFormat)) == set(_MIME_TYPES) >= set(InputValidator.AUDIO_FORMATS):
+    raise RuntimeError("_MIME_TYPES must cover every output and input audio format")
+
+class SplitSegment(TypedDict):
+    """Custom split range, in seconds"""
+    start: float
+    end: float
+    name: NotRequired[str]
+
+
+# Validator for the /split-audio segments form field (a JSON list of ranges)
+_SEGMENTS_ADAPTER = TypeAdapter(List[SplitSegment])
+
+# Compression level -> target bitrate (Requirement 4.2)
+_BITRATE_MAP = {
+    "low": "320k",
+    "medium": "192k",
+    "high": "128k"
+}
+
+# /health re-checks FFmpeg at most this often (seconds); probes in between
+# get the cached answer instead of a subprocess each. This is the only cache
+# of the answer: each expiry runs `ffmpeg -version` again, so a removed
+# binary shows as unhealthy within one TTL
+HEALTH_CACHE_TTL = 30.0
+_HEALTH_CACHE = {"ffmpeg_available": False, "error": None, "checked_at": None}
+
+# JSON response class for /health
+_HealthResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+# FFmpeg jobs allowed to run at once; each encoder already threads where it
+# helps, so more concurrent jobs than this only oversubscribe the CPU
+FFMPEG_CONCURRENCY = max(1, (os.cpu_count() or 2) // 2)
+
+# Event loop -> semaphore bounding FFmpeg jobs (asyncio primitives are
+# bound to the loop they are first used on)
+_FFMPEG_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+# Wrapper shared by all requests; created on first use so a missing FFmpeg
+# fails requests (and /health) instead of the import
+_FFMPEG: Optional[FFmpegWrapper] = None
+_FFMPEG_LOCK = threading.Lock()
+
 
 def create_http_exception(code: ErrorCode, details: str = None) -> HTTPException:
     """
@@ -35,122 +123,350 @@ def create_http_exception(code: ErrorCode, details: str = None) -> HTTPException
     )
 
 
-@router.get("/health")
-async def health_check():
+def _ffmpeg() -> FFmpegWrapper:
     """
-    Health check endpoint
-    Returns status and FFmpeg availability within 100ms
-    Requirements: 10.6
+    Get the shared FFmpeg wrapper, creating it on first use
+    
+    Returns:
+        FFmpegWrapper instance
+        
+    Raises:
+        RuntimeError: If FFmpeg is not installed
     """
-    import time
-    from .ffmpeg_wrapper import FFmpegWrapper
+    global _FFMPEG
+    if _FFMPEG is None:
+        with _FFMPEG_LOCK:
+            if _FFMPEG is None:
+                _FFMPEG = FFmpegWrapper()
+    return _FFMPEG
+
+
+@lru_cache(maxsize=1024)
+def _content_disposition(filename: str) -> str:
+    """
+    Build the attachment Content-Disposition header for a download
+    Non-ASCII names go in filename* (RFC 6266); filename keeps an ASCII
+    fallback, since header values must be latin-1
     
-    start_time = time.time()
+    Args:
+        filename: Download filename (already sanitized)
+        
+    Returns:
+        Header value
+    """
+    ascii_name = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    if ascii_name == filename:
+        return f"attachment; filename={filename}"
+    return f"attachment; filename={ascii_name}; filename*=UTF-8''{quote(filename)}"
+
+
+_SPLIT_ZIP_DISPOSITION = _content_disposition("split_audio_segments.zip")
+
+
+async def _read_input(file: UploadFile, video: bool = False) -> Tuple[bytes, str]:
+    """
+    Validate an uploaded file and read it
     
-    try:
-        ffmpeg = FFmpegWrapper()
-        ffmpeg_available = ffmpeg.check_availability()
+    Args:
+        file: Uploaded file
+        video: Validate as a video file instead of an audio file
         
-        # Calculate response time
-        response_time_ms = (time.time() - start_time) * 1000
+    Returns:
+        Tuple of (file data, input format from the filename)
         
-        status_value = "healthy" if ffmpeg_available else "unhealthy"
+    Raises:
+        HTTPException: If validation fails or the file is too large
+    """
+    if video:
+        await InputValidator.validate_video_file(file)
+    else:
+        await InputValidator.validate_audio_file(file)
+    
+    # Get input format from filename
+    input_format = Path(file.filename or "").suffix.lower().lstrip(".")
+    
+    # Read file data (size limit enforced while reading)
+    file_data = await read_upload(file)
+    
+    return file_data, input_format
+
+
+async def _run_ffmpeg(func, *args, **kwargs):
+    """
+    Run a blocking FFmpeg wrapper call off the event loop
+    Every endpoint goes through here, so limits on FFmpeg work apply once;
+    at most FFMPEG_CONCURRENCY calls run at a time, the rest wait their turn
+    
+    Args:
+        func: Wrapper method to call
+        *args, **kwargs: Arguments for func
         
-        logger.debug(f"Health check completed in {response_time_ms:.2f}ms")
+    Returns:
+        Result of func
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _FFMPEG_SEMAPHORES.get(loop)
+    if semaphore is None:
+        semaphore = _FFMPEG_SEMAPHORES[loop] = asyncio.Semaphore(FFMPEG_CONCURRENCY)
+    
+    async with semaphore:
+        return await run_in_threadpool(func, *args, **kwargs)
+
+
+# Batches concurrent convert/compress requests; a batch holds one FFmpeg slot
+_BATCH_SCHEDULER = BatchScheduler(run_blocking=_run_ffmpeg)
+
+
+# Upload names repeat ("audio", "recording", ...), so sanitized stems are
+# memoized; sanitize_filename is a pure function of its input
+_sanitize_stem = lru_cache(maxsize=1024)(InputValidator.sanitize_filename)
+
+
+def _output_filename(file: UploadFile, suffix: str, default_stem: str = "audio") -> str:
+    """
+    Build the download filename from the uploaded file's name
+    
+    Args:
+        file: Uploaded file
+        suffix: Text appended to the sanitized stem, including the extension
+        default_stem: Stem used when the upload has no filename
         
-        return {
-            "status": status_value,
-            "ffmpeg_available": ffmpeg_available,
-            "version": "1.0.0",
-            "response_time_ms": round(response_time_ms, 2)
-        }
-    except Exception as e:
-        # Calculate response time even on error
-        response_time_ms = (time.time() - start_time) * 1000
+    Returns:
+        Output filename
+    """
+    original_name = Path(file.filename or default_stem).stem
+    return f"{_sanitize_stem(original_name)}{suffix}"
+
+
+def _audio_response(data: bytes, output_filename: str, output_format: str) -> Response:
+    """
+    Build the download response for an in-memory result
+    Sent in a single send rather than iterated out of a buffer
+    
+    Args:
+        data: Output audio data
+        output_filename: Download filename
+        output_format: Output format, selecting the MIME type
+        
+    Returns:
+        Response with attachment disposition
+    """
+    return Response(
+        content=data,
+        media_type=_MIME_TYPES[output_format],
+        headers={"Content-Disposition": _content_disposition(output_filename)}
+    )
+
+
+async def read_upload(
+    file: UploadFile,
+    limit: int = InputValidator.MAX_FILE_SIZE,
+    detail: str = "File exceeds 100MB limit"
+) -> bytes:
+    """
+    Read an uploaded file, enforcing the size limit before or while reading
+    When the upload size is known the file is read with one exact-size
+    allocation; otherwise it is read in chunks and rejected as soon as it
+    crosses the limit, without loading the whole body into memory
+    
+    Args:
+        file: Uploaded file
+        limit: Maximum size in bytes
+        detail: Error detail for oversized files
         
-        logger.error(f"Health check failed: {e}")
+    Returns:
+        File contents
+        
+    Raises:
+        HTTPException: 413 if the file exceeds the limit
+    """
+    # The multipart parser counts the bytes it spools, so file.size is exact
+    if file.size is not None:
+        if file.size > limit:
+            logger.error("File size exceeds limit: %s > %s", file.size, limit)
+            raise HTTPException(
+                status_code=413,
+                detail=detail
+            )
+        # A sized read allocates the result once, with no buffer growth or
+        # copy out of an intermediate buffer
+        return await file.read(file.size)
+    
+    buffer = io.BytesIO()
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        if buffer.tell() + len(chunk) > limit:
+            logger.error("File size exceeds limit: more than %s bytes", limit)
+            raise HTTPException(
+                status_code=413,
+                detail=detail
+            )
+        buffer.write(chunk)
+    
+    # getvalue() hands back the buffer's bytes without another copy
+    return buffer.getvalue()
+
+
+def _header_duration(file_data: bytes, input_format: str) -> Optional[float]:
+    """
+    Get the audio duration from the file header, in process
+    Used for the compression size estimate only, so an approximation is fine
+    
+    Args:
+        file_data: Audio file data
+        input_format: Audio format
+        
+    Returns:
+        Duration in seconds, or None if the header does not tell
+    """
+    header = _probe_fast(file_data, input_format)
+    if header.get("duration"):
+        return header["duration"]
+    
+    if header.get("bit_rate"):
+        # Constant-bitrate estimate, close enough for MP3/OGG
+        return len(file_data) * 8 / header["bit_rate"]
+    
+    if mutagen is not None:
+        try:
+            audio = mutagen.File(io.BytesIO(file_data))
+        except Exception:
+            audio = None
+        if audio is not None and audio.info.length:
+            return audio.info.length
+    
+    return None
+
+
+class _ZipChunks:
+    """Write-only sink collecting what ZipFile writes until it is drained"""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> List[bytes]:
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def _stream_zip(entries: List[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Build a ZIP archive incrementally, yielding it as it is written
+    Entries are stored, not deflated: the segments are already compressed
+    audio (or PCM, which deflates poorly), so DEFLATE only costs CPU. Each
+    entry is released once written, so only one copy of the segments is held
+    
+    Args:
+        entries: (archive name, data) per file; consumed by the generator
+        
+    Yields:
+        ZIP archive chunks
+    """
+    sink = _ZipChunks()
+    # An unseekable sink makes ZipFile write data descriptors instead of
+    # seeking back to patch local headers
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as zip_file:
+        for i, (name, data) in enumerate(entries):
+            entries[i] = None
+            zip_file.writestr(name, data)
+            del data
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+@router.get("/health")
+async def health_check():
+    """
+    Health check endpoint
+    Returns status and FFmpeg availability within 100ms
+    FFmpeg availability is cached for HEALTH_CACHE_TTL seconds
+    Requirements: 10.6
+    """
+    start_time = time.time()
+    
+    # Probe FFmpeg only when the cached answer has expired
+    now = time.monotonic()
+    if _HEALTH_CACHE["checked_at"] is None or now - _HEALTH_CACHE["checked_at"] >= HEALTH_CACHE_TTL:
+        try:
+            ffmpeg_available = await run_in_threadpool(lambda: _ffmpeg().check_availability())
+            error = None
+        except Exception as e:
+            logger.error("Health check failed: %s", e)
+            ffmpeg_available = False
+            error = str(e)
         
-        return {
-            "status": "unhealthy",
-            "ffmpeg_available": False,
-            "version": "1.0.0",
-            "response_time_ms": round(response_time_ms, 2),
-            "error": str(e)
-        }
+        _HEALTH_CACHE.update(ffmpeg_available=ffmpeg_available, error=error, checked_at=now)
+    
+    # Calculate response time
+    response_time_ms = (time.time() - start_time) * 1000
+    
+    status_value = "healthy" if _HEALTH_CACHE["ffmpeg_available"] else "unhealthy"
+    
+    logger.debug("Health check completed in %.2fms", response_time_ms)
+    
+    response = {
+        "status": status_value,
+        "ffmpeg_available": _HEALTH_CACHE["ffmpeg_available"],
+        "version": "1.0.0",
+        "response_time_ms": round(response_time_ms, 2)
+    }
+    if _HEALTH_CACHE["error"] is not None:
+        response["error"] = _HEALTH_CACHE["error"]
+    
+    # Returning a response object skips FastAPI's jsonable_encoder pass
+    return _HealthResponse(response)
 
 
 @router.post("/convert")
 async def convert_audio(
     file: UploadFile = File(...),
-    target_format: Literal["mp3", "wav", "flac", "aac", "ogg", "m4a"] = Form(...)
+    target_format: AudioFormat = Form(...)
 ):
     """
     Convert audio file to target format
     Preserves metadata and quality
     Requirements: 1.1, 1.2, 1.4, 9.1
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Convert request: {file.filename} -> {target_format}")
+    logger.info("Convert request: %s -> %s", file.filename, target_format)
     
     try:
-        # Validate audio file
-        await InputValidator.validate_audio_file(file)
-        
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        
-        # Read file data
-        file_data = await file.read()
-        
-        # Check file size
-        if len(file_data) > InputValidator.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file)
         
         # Convert format
-        ffmpeg = FFmpegWrapper()
-        converted_data = ffmpeg.convert_format(
-            input_data=file_data,
-            input_format=input_format,
-            output_format=target_format,
-            preserve_metadata=True
+        ffmpeg = _ffmpeg()
+        # Concurrent conversions with the same formats share one FFmpeg run
+        converted_data = await _BATCH_SCHEDULER.submit(
+            ("convert", input_format, target_format, size_band(file_data)),
+            file_data,
+            partial(
+                ffmpeg.convert_batch,
+                input_format=input_format,
+                output_format=target_format,
+                preserve_metadata=True
+            )
         )
         
         # Generate output filename
-        original_name = Path(file.filename or "audio").stem
-        sanitized_name = InputValidator.sanitize_filename(original_name)
-        output_filename = f"{sanitized_name}.{target_format}"
-        
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(target_format, "audio/mpeg")
-        
-        logger.info(f"Conversion successful: {output_filename}")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(converted_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        output_filename = _output_filename(file, f".{target_format}")
+        
+        logger.info("Conversion successful: %s", output_filename)
+        
+        return _audio_response(converted_data, output_filename, target_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Conversion error: {str(e)}")
+        logger.error("Conversion error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Conversion failed: {str(e)}"
@@ -168,90 +484,50 @@ async def trim_audio(
     Times in seconds
     Requirements: 2.1, 2.2, 2.6, 9.1
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Trim request: {file.filename} from {start_time}s to {end_time}s")
-    logger.info(f"Request details - Content-Type: {file.content_type}, Size: {file.size if hasattr(file, 'size') else 'unknown'}")
+    logger.info("Trim request: %s from %ss to %ss", file.filename, start_time, end_time)
+    logger.debug("Request details - Content-Type: %s, Size: %s", file.content_type, file.size)
     
     try:
-        # Validate audio file
-        await InputValidator.validate_audio_file(file)
-        
         # Validate time range
         InputValidator.validate_time_range(start_time, end_time)
         
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        logger.info(f"Detected input format: {input_format}")
-        
-        # Read file data
-        logger.debug("Reading uploaded file data...")
-        file_data = await file.read()
-        logger.info(f"File data read successfully: {len(file_data)} bytes")
-        
-        # Check file size
-        if len(file_data) > InputValidator.MAX_FILE_SIZE:
-            logger.error(f"File size exceeds limit: {len(file_data)} > {InputValidator.MAX_FILE_SIZE}")
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file)
+        logger.debug("File data read successfully: %d bytes (%s)", len(file_data), input_format)
         
         # Log file header for debugging (first 32 bytes as hex)
-        if len(file_data) >= 32:
-            header_hex = file_data[:32].hex()
-            logger.debug(f"File header (hex): {header_hex}")
+        if len(file_data) >= 32 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("File header (hex): %s", file_data[:32].hex())
         
         # Trim audio
-        logger.info("Starting FFmpeg trimming operation...")
-        ffmpeg = FFmpegWrapper()
+        ffmpeg = _ffmpeg()
         try:
-            trimmed_data = ffmpeg.trim_audio(
+            trimmed_data = await _run_ffmpeg(
+                ffmpeg.trim_audio,
                 input_data=file_data,
                 input_format=input_format,
                 start_time=start_time,
                 end_time=end_time
             )
-            logger.info(f"Trimming completed successfully: {len(trimmed_data)} bytes output")
+            logger.debug("Trimming completed successfully: %d bytes output", len(trimmed_data))
         except Exception as ffmpeg_error:
-            logger.error(f"FFmpeg trimming failed: {str(ffmpeg_error)}")
-            logger.error(f"Input parameters - format: {input_format}, start: {start_time}s, end: {end_time}s, size: {len(file_data)} bytes")
+            logger.error("FFmpeg trimming failed: %s", ffmpeg_error)
+            logger.error("Input parameters - format: %s, start: %ss, end: %ss, size: %d bytes", input_format, start_time, end_time, len(file_data))
             raise
         
         # Generate output filename
-        original_name = Path(file.filename or "audio").stem
-        sanitized_name = InputValidator.sanitize_filename(original_name)
-        output_filename = f"{sanitized_name}_trimmed.{input_format}"
-        
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(input_format, "audio/mpeg")
-        
-        logger.info(f"Trimming successful: {output_filename} ({mime_type})")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(trimmed_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        output_filename = _output_filename(file, f"_trimmed.{input_format}")
+        
+        logger.info("Trimming successful: %s", output_filename)
+        
+        return _audio_response(trimmed_data, output_filename, input_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Trimming error: {str(e)}")
-        logger.error(f"Error type: {type(e).__name__}")
-        logger.error(f"Request context - file: {file.filename}, start: {start_time}, end: {end_time}")
+        logger.error("Trimming error: %s", e)
+        logger.error("Error type: %s", type(e).__name__)
+        logger.error("Request context - file: %s, start: %s, end: %s", file.filename, start_time, end_time)
         raise HTTPException(
             status_code=500,
             detail=f"Trimming failed: {str(e)}"
@@ -261,19 +537,14 @@ async def trim_audio(
 @router.post("/merge")
 async def merge_audio(
     files: List[UploadFile] = File(...),
-    output_format: Literal["mp3", "wav", "flac", "aac", "ogg", "m4a"] = Form(...)
+    output_format: AudioFormat = Form(...)
 ):
     """
     Merge multiple audio files into one
     Handles format conversion and resampling
     Requirements: 3.1, 3.2, 3.5, 9.1
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Merge request: {len(files)} files -> {output_format}")
+    logger.info("Merge request: %d files -> %s", len(files), output_format)
     
     try:
         # Validate file count (2-10 files)
@@ -289,55 +560,48 @@ async def merge_audio(
                 detail="Maximum 10 files allowed for merging"
             )
         
-        # Validate all files and read their data
-        input_files_data = []
-        input_formats = []
-        
-        logger.info(f"Processing {len(files)} files for merge")
+        # Validate all files concurrently
+        await InputValidator.validate_audio_files(files)
         
-        for i, file in enumerate(files):
-            logger.info(f"Processing file {i+1}: {file.filename}")
-            
+        async def read_input(i: int, file: UploadFile):
             try:
-                # Validate audio file
-                await InputValidator.validate_audio_file(file)
-                logger.info(f"File {i+1} validation successful")
-                
                 # Get input format from filename
                 input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-                logger.debug(f"File {i+1} format: {input_format}")
-                
-                # Read file data
-                logger.debug(f"Reading file {i+1} data...")
-                file_data = await file.read()
-                logger.info(f"File {i+1} read: {len(file_data)} bytes")
                 
-                # Check file size
-                if len(file_data) > InputValidator.MAX_FILE_SIZE:
-                    logger.error(f"File {i+1} exceeds size limit: {len(file_data)} bytes > {InputValidator.MAX_FILE_SIZE}")
-                    raise HTTPException(
-                        status_code=413,
-                        detail=f"File {i+1} exceeds 100MB limit"
-                    )
+                # Read file data (size limit enforced while reading)
+                file_data = await read_upload(file, detail=f"File {i+1} exceeds 100MB limit")
                 
-                input_files_data.append(file_data)
-                input_formats.append(input_format)
-                
-                logger.info(f"File {i+1} processed successfully: {file.filename} ({input_format}, {len(file_data)} bytes)")
+                logger.debug("File %d read: %s (%s, %d bytes)", i + 1, file.filename, input_format, len(file_data))
+                return file_data, input_format
                 
             except HTTPException as e:
-                logger.error(f"File {i+1} validation failed: {e.detail}")
+                logger.error("File %d read failed: %s", i + 1, e.detail)
                 raise
             except Exception as e:
-                logger.error(f"Unexpected error processing file {i+1}: {str(e)}")
+                logger.error("Unexpected error processing file %d: %s", i + 1, e)
                 raise HTTPException(
                     status_code=400,
                     detail=f"Error processing file {i+1}: {str(e)}"
                 )
         
+        # Read the file data concurrently
+        results = await asyncio.gather(
+            *(read_input(i, file) for i, file in enumerate(files)),
+            return_exceptions=True
+        )
+        
+        # Report the first failing file, in upload order
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        
+        input_files_data = [file_data for file_data, _ in results]
+        input_formats = [input_format for _, input_format in results]
+        
         # Merge audio files
-        ffmpeg = FFmpegWrapper()
-        merged_data = ffmpeg.merge_audio(
+        ffmpeg = _ffmpeg()
+        merged_data = await _run_ffmpeg(
+            ffmpeg.merge_audio,
             input_files=input_files_data,
             input_formats=input_formats,
             output_format=output_format
@@ -346,30 +610,14 @@ async def merge_audio(
         # Generate output filename
         output_filename = f"merged_audio.{output_format}"
         
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(output_format, "audio/mpeg")
+        logger.info("Merge successful: %s (%d bytes)", output_filename, len(merged_data))
         
-        logger.info(f"Merge successful: {output_filename} ({len(merged_data)} bytes)")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(merged_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        return _audio_response(merged_data, output_filename, output_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Merge error: {str(e)}")
+        logger.error("Merge error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Merge failed: {str(e)}"
@@ -386,66 +634,25 @@ async def compress_audio(
     Levels: low (320kbps), medium (192kbps), high (128kbps)
     Requirements: 4.1, 4.2, 4.4, 4.5, 9.1
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Compress request: {file.filename} at {level} compression")
+    logger.info("Compress request: %s at %s compression", file.filename, level)
     
     try:
-        # Validate audio file
-        await InputValidator.validate_audio_file(file)
-        
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        
-        # Read file data
-        file_data = await file.read()
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file)
         original_size = len(file_data)
         
-        # Check file size
-        if original_size > InputValidator.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
-        
         # Map compression levels to bitrates (Requirement 4.2)
-        bitrate_map = {
-            "low": "320k",
-            "medium": "192k",
-            "high": "128k"
-        }
-        bitrate = bitrate_map[level]
+        bitrate = _BITRATE_MAP[level]
         
         # Calculate estimated file size reduction (Requirement 4.4)
         # Rough estimation: bitrate * duration
-        # For estimation purposes, we'll probe the duration
+        # The duration comes from the file header, without spawning ffprobe
         try:
-            probe_command = [
-                "ffprobe",
-                "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                "-i", "pipe:0"
-            ]
-            
-            import subprocess
-            probe_result = subprocess.run(
-                probe_command,
-                input=file_data,
-                capture_output=True,
-                timeout=10
-            )
-            
-            duration = None
-            if probe_result.returncode == 0:
-                try:
-                    duration = float(probe_result.stdout.decode().strip())
-                    logger.debug(f"Audio duration: {duration} seconds")
-                except (ValueError, AttributeError):
-                    logger.warning("Could not determine duration for size estimation")
+            duration = _header_duration(file_data, input_format)
+            if duration is None:
+                logger.debug("Could not determine duration for size estimation")
+            else:
+                logger.debug("Audio duration: %s seconds", duration)
             
             # Estimate compressed size if we have duration
             if duration:
@@ -453,58 +660,45 @@ async def compress_audio(
                 target_bitrate_kbps = int(bitrate.rstrip('k'))
                 estimated_size = int((target_bitrate_kbps * 1000 / 8) * duration)
                 reduction_percent = int((1 - estimated_size / original_size) * 100) if estimated_size < original_size else 0
-                logger.info(f"Estimated size reduction: {reduction_percent}% (from {original_size} to ~{estimated_size} bytes)")
+                logger.info("Estimated size reduction: %s%% (from %s to ~%s bytes)", reduction_percent, original_size, estimated_size)
         except Exception as e:
-            logger.warning(f"Size estimation failed: {e}")
+            logger.warning("Size estimation failed: %s", e)
         
         # Compress audio
-        ffmpeg = FFmpegWrapper()
-        compressed_data = ffmpeg.compress_audio(
-            input_data=file_data,
-            input_format=input_format,
-            bitrate=bitrate
+        ffmpeg = _ffmpeg()
+        # Concurrent compressions with the same format and bitrate share one FFmpeg run
+        compressed_data = await _BATCH_SCHEDULER.submit(
+            ("compress", input_format, bitrate, size_band(file_data)),
+            file_data,
+            partial(
+                ffmpeg.compress_batch,
+                input_format=input_format,
+                bitrate=bitrate
+            )
         )
         
         compressed_size = len(compressed_data)
         actual_reduction_percent = int((1 - compressed_size / original_size) * 100) if compressed_size < original_size else 0
         
-        logger.info(f"Compression complete: {original_size} -> {compressed_size} bytes ({actual_reduction_percent}% reduction)")
+        logger.info("Compression complete: %s -> %s bytes (%s%% reduction)", original_size, compressed_size, actual_reduction_percent)
         
         # Generate output filename
-        original_name = Path(file.filename or "audio").stem
-        sanitized_name = InputValidator.sanitize_filename(original_name)
         
         # Determine output format (may change if WAV/FLAC was converted to MP3)
         output_format = input_format
         if input_format in ["wav", "flac"]:
             output_format = "mp3"  # These formats are converted to MP3 for compression
         
-        output_filename = f"{sanitized_name}_compressed.{output_format}"
+        output_filename = _output_filename(file, f"_compressed.{output_format}")
         
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(output_format, "audio/mpeg")
+        logger.info("Compression successful: %s", output_filename)
         
-        logger.info(f"Compression successful: {output_filename}")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(compressed_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        return _audio_response(compressed_data, output_filename, output_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Compression error: {str(e)}")
+        logger.error("Compression error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Compression failed: {str(e)}"
@@ -514,41 +708,24 @@ async def compress_audio(
 @router.post("/extract")
 async def extract_audio(
     file: UploadFile = File(...),
-    output_format: Literal["mp3", "wav", "flac", "aac", "ogg", "m4a"] = Form(...)
+    output_format: AudioFormat = Form(...)
 ):
     """
     Extract audio track from video file
     Supports MP4, AVI, MKV, MOV, WEBM
     Requirements: 5.1, 5.2, 5.3, 9.1
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Extract request: {file.filename} -> {output_format}")
+    logger.info("Extract request: %s -> %s", file.filename, output_format)
     
     try:
-        # Validate video file
-        await InputValidator.validate_video_file(file)
-        
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        
-        # Read file data
-        file_data = await file.read()
-        
-        # Check file size
-        if len(file_data) > InputValidator.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file, video=True)
         
         # Extract audio from video
-        ffmpeg = FFmpegWrapper()
+        ffmpeg = _ffmpeg()
         try:
-            extracted_data = ffmpeg.extract_audio(
+            extracted_data = await _run_ffmpeg(
+                ffmpeg.extract_audio,
                 input_data=file_data,
                 input_format=input_format,
                 output_format=output_format
@@ -568,34 +745,16 @@ async def extract_audio(
             )
         
         # Generate output filename
-        original_name = Path(file.filename or "video").stem
-        sanitized_name = InputValidator.sanitize_filename(original_name)
-        output_filename = f"{sanitized_name}_audio.{output_format}"
-        
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(output_format, "audio/mpeg")
-        
-        logger.info(f"Extraction successful: {output_filename} ({len(extracted_data)} bytes)")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(extracted_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        output_filename = _output_filename(file, f"_audio.{output_format}", default_stem="video")
+        
+        logger.info("Extraction successful: %s (%d bytes)", output_filename, len(extracted_data))
+        
+        return _audio_response(extracted_data, output_filename, output_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Extraction error: {str(e)}")
+        logger.error("Extraction error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Extraction failed: {str(e)}"
@@ -613,31 +772,11 @@ async def split_audio(
     Split audio file into multiple segments
     Modes: time (equal intervals), segments (custom time ranges)
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import json
-    import tempfile
-    import os
-    
-    logger.info(f"Split request: {file.filename} mode={split_mode}")
+    logger.info("Split request: %s mode=%s", file.filename, split_mode)
     
     try:
-        # Validate audio file
-        await InputValidator.validate_audio_file(file)
-        
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        
-        # Read file data
-        file_data = await file.read()
-        
-        # Check file size
-        if len(file_data) > InputValidator.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file)
         
         # Parse segments for custom mode
         segment_list = []
@@ -648,15 +787,16 @@ async def split_audio(
                     detail="Segments data required for custom split mode"
                 )
             try:
-                segment_list = json.loads(segments)
-            except json.JSONDecodeError:
+                # Parses and checks the structure in one pass
+                segment_list = _SEGMENTS_ADAPTER.validate_json(segments)
+            except ValidationError:
                 raise HTTPException(
                     status_code=400,
                     detail="Invalid segments JSON format"
                 )
         
         # Split audio
-        ffmpeg = FFmpegWrapper()
+        ffmpeg = _ffmpeg()
         
         if split_mode == "time":
             if not interval_duration:
@@ -664,45 +804,39 @@ async def split_audio(
                     status_code=400,
                     detail="Interval duration required for time split mode"
                 )
-            split_files = ffmpeg.split_audio_by_time(
+            split_files = await _run_ffmpeg(
+                ffmpeg.split_audio_by_time,
                 input_data=file_data,
                 input_format=input_format,
                 interval_seconds=interval_duration
             )
         else:  # segments mode
-            split_files = ffmpeg.split_audio_by_segments(
+            split_files = await _run_ffmpeg(
+                ffmpeg.split_audio_by_segments,
                 input_data=file_data,
                 input_format=input_format,
                 segments=segment_list
             )
         
-        # Create ZIP file with all segments
-        import zipfile
-        from io import BytesIO
-        
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for i, file_data in enumerate(split_files):
-                segment_filename = f"segment_{i+1}.{input_format}"
-                zip_file.writestr(segment_filename, file_data)
+        logger.info("Split successful: %d segments created", len(split_files))
         
-        zip_buffer.seek(0)
+        # Stream the ZIP as it is built instead of assembling it in memory first
+        entries = [
+            (f"segment_{i+1}.{input_format}", segment_data)
+            for i, segment_data in enumerate(split_files)
+        ]
+        del split_files
         
-        logger.info(f"Split successful: {len(split_files)} segments created")
-        
-        # Return ZIP file as download
         return StreamingResponse(
-            BytesIO(zip_buffer.read()),
+            _stream_zip(entries),
             media_type="application/zip",
-            headers={
-                "Content-Disposition": f"attachment; filename=split_audio_segments.zip"
-            }
+            headers={"Content-Disposition": _SPLIT_ZIP_DISPOSITION}
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Split error: {str(e)}")
+        logger.error("Split error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Split failed: {str(e)}"
@@ -721,29 +855,11 @@ async def adjust_volume(
     Adjust audio volume levels
     Modes: percentage (0-500%), decibels (-30 to +30), normalize (target dB)
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Volume adjust request: {file.filename} mode={adjustment_mode}")
+    logger.info("Volume adjust request: %s mode=%s", file.filename, adjustment_mode)
     
     try:
-        # Validate audio file
-        await InputValidator.validate_audio_file(file)
-        
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        
-        # Read file data
-        file_data = await file.read()
-        
-        # Check file size
-        if len(file_data) > InputValidator.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file)
         
         # Validate adjustment parameters
         if adjustment_mode == "percentage":
@@ -781,8 +897,9 @@ async def adjust_volume(
                 )
         
         # Adjust volume
-        ffmpeg = FFmpegWrapper()
-        adjusted_data = ffmpeg.adjust_volume(
+        ffmpeg = _ffmpeg()
+        adjusted_data = await _run_ffmpeg(
+            ffmpeg.adjust_volume,
             input_data=file_data,
             input_format=input_format,
             adjustment_mode=adjustment_mode,
@@ -792,34 +909,16 @@ async def adjust_volume(
         )
         
         # Generate output filename
-        original_name = Path(file.filename or "audio").stem
-        sanitized_name = InputValidator.sanitize_filename(original_name)
-        output_filename = f"{sanitized_name}_volume_adjusted.{input_format}"
-        
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(input_format, "audio/mpeg")
-        
-        logger.info(f"Volume adjustment successful: {output_filename}")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(adjusted_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        output_filename = _output_filename(file, f"_volume_adjusted.{input_format}")
+        
+        logger.info("Volume adjustment successful: %s", output_filename)
+        
+        return _audio_response(adjusted_data, output_filename, input_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Volume adjustment error: {str(e)}")
+        logger.error("Volume adjustment error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Volume adjustment failed: {str(e)}"
@@ -837,17 +936,9 @@ async def change_speed(
     Speed: 0.25x to 4.0x
     Preserve pitch: maintain original pitch while changing speed
     """
-    from .ffmpeg_wrapper import FFmpegWrapper
-    from .validators import InputValidator
-    from pathlib import Path
-    import io
-    
-    logger.info(f"Speed change request: {file.filename} speed={speed}x pitch_preserve={preserve_pitch}")
+    logger.info("Speed change request: %s speed=%sx pitch_preserve=%s", file.filename, speed, preserve_pitch)
     
     try:
-        # Validate audio file
-        await InputValidator.validate_audio_file(file)
-        
         # Validate speed parameter
         if not (0.25 <= speed <= 4.0):
             raise HTTPException(
@@ -855,22 +946,13 @@ async def change_speed(
                 detail="Speed must be between 0.25x and 4.0x"
             )
         
-        # Get input format from filename
-        input_format = Path(file.filename or "").suffix.lower().lstrip(".")
-        
-        # Read file data
-        file_data = await file.read()
-        
-        # Check file size
-        if len(file_data) > InputValidator.MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=413,
-                detail="File exceeds 100MB limit"
-            )
+        # Validate and read the upload
+        file_data, input_format = await _read_input(file)
         
         # Change speed
-        ffmpeg = FFmpegWrapper()
-        speed_changed_data = ffmpeg.change_speed(
+        ffmpeg = _ffmpeg()
+        speed_changed_data = await _run_ffmpeg(
+            ffmpeg.change_speed,
             input_data=file_data,
             input_format=input_format,
             speed=speed,
@@ -878,35 +960,17 @@ async def change_speed(
         )
         
         # Generate output filename
-        original_name = Path(file.filename or "audio").stem
-        sanitized_name = InputValidator.sanitize_filename(original_name)
         speed_suffix = f"{speed:.2f}x".replace(".", "_")
-        output_filename = f"{sanitized_name}_speed_{speed_suffix}.{input_format}"
-        
-        # Determine MIME type
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "wav": "audio/wav",
-            "flac": "audio/flac",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "m4a": "audio/mp4"
-        }
-        mime_type = mime_types.get(input_format, "audio/mpeg")
-        
-        logger.info(f"Speed change successful: {output_filename}")
-        
-        # Return streaming response
-        return StreamingResponse(
-            io.BytesIO(speed_changed_data),
-            media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={output_filename}"}
-        )
+        output_filename = _output_filename(file, f"_speed_{speed_suffix}.{input_format}")
+        
+        logger.info("Speed change successful: %s", output_filename)
+        
+        return _audio_response(speed_changed_data, output_filename, input_format)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Speed change error: {str(e)}")
+        logger.error("Speed change error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Speed change failed: {str(e)}"
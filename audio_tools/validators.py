@@ -3,6 +3,7 @@ Input validation framework for audio processing
 Validates file types, sizes, formats, and parameters
 """
 
+import asyncio
 import re
 from pathlib import Path
 from typing import List, Optional
@@ -12,6 +13,21 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _signature_pattern(signatures: List[bytes]) -> "re.Pattern[bytes]":
+    """
+    Compile format signatures into one alternation
+    Finding any of them then takes a single scan of the header rather than
+    one substring search per signature
+    
+    Args:
+        signatures: Magic byte sequences of one format
+        
+    Returns:
+        Compiled bytes pattern matching any of the signatures
+    """
+    return re.compile(b"|".join(re.escape(sig) for sig in signatures))
+
+
 class InputValidator:
     """
     Validates user inputs and uploaded files
@@ -35,6 +51,22 @@ class InputValidator:
         "m4a": [b"ftyp"],
     }
     
+    # Bytes of the file header scanned for signatures
+    SIGNATURE_SCAN_SIZE = 512
+    
+    # Filename sanitization patterns (see sanitize_filename)
+    _UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\s\-\.]")
+    _WHITESPACE_RUN = re.compile(r"\s+")
+    _DOT_RUN = re.compile(r"\.{2,}")
+    
+    # One compiled pattern per format (see _signature_pattern)
+    _AUDIO_SIGNATURE_PATTERNS = {
+        ext: _signature_pattern(sigs) for ext, sigs in AUDIO_SIGNATURES.items()
+    }
+    
+    # MP3 frame sync: 0xFF followed by a byte with its top 3 bits set
+    _MP3_FRAME_SYNC = re.compile(rb"\xFF[\xE0-\xFF]")
+    
     # Video file signatures
     VIDEO_SIGNATURES = {
         "mp4": [b"ftyp", b"moov"],
@@ -44,6 +76,10 @@ class InputValidator:
         "webm": [b"\x1A\x45\xDF\xA3"],
     }
     
+    _VIDEO_SIGNATURE_PATTERNS = {
+        ext: _signature_pattern(sigs) for ext, sigs in VIDEO_SIGNATURES.items()
+    }
+    
     @classmethod
     async def validate_audio_file(cls, file: UploadFile) -> bool:
         """
@@ -61,52 +97,67 @@ class InputValidator:
         """
         # Check file extension
         filename = file.filename or ""
-        logger.debug(f"Validating audio file: {filename}")
-        
         ext = Path(filename).suffix.lower().lstrip(".")
-        logger.debug(f"File extension: {ext}")
+        logger.debug("Validating audio file: %s (%s)", filename, ext)
         
         if ext not in cls.AUDIO_FORMATS:
-            logger.error(f"Unsupported format: {ext}")
+            logger.error("Unsupported format: %s", ext)
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported audio format: {ext}. Supported formats: {', '.join(cls.AUDIO_FORMATS)}"
             )
         
         # Read first chunk to check file signature
-        logger.debug(f"Reading file signature for {filename}")
         try:
             original_position = file.file.tell() if hasattr(file.file, 'tell') else 0
-            logger.debug(f"Original file position: {original_position}")
-            
-            content = await file.read(8192)
-            logger.debug(f"Read {len(content)} bytes for signature validation")
+            content = cls._read_signature_bytes(file)
             
             # Reset file pointer to original position
             if hasattr(file.file, 'seek'):
                 file.file.seek(original_position)
-                logger.debug("Reset file position using file.seek()")
             else:
                 await file.seek(0)
-                logger.debug("Reset file position using await file.seek(0)")
                 
         except Exception as e:
-            logger.error(f"Error reading file signature: {str(e)}")
+            logger.error("Error reading file signature: %s", e)
             raise HTTPException(
                 status_code=400,
                 detail=f"Error reading file: {str(e)}"
             )
         
         # Validate file signature
-        logger.debug(f"Checking signature for format: {ext}")
         if not cls._check_audio_signature(content, ext):
-            logger.error(f"File signature validation failed for {filename}")
+            logger.error("File signature validation failed for %s", filename)
             raise HTTPException(
                 status_code=400,
                 detail=f"File does not match declared format: {ext}"
             )
         
-        logger.info(f"Audio file validated: {filename} ({ext})")
+        logger.info("Audio file validated: %s (%s)", filename, ext)
+        return True
+    
+    @classmethod
+    async def validate_audio_files(cls, files: List[UploadFile]) -> bool:
+        """
+        Validate several audio files concurrently
+        Requirements: 6.2, 11.1
+        
+        Args:
+            files: Uploaded files to validate
+            
+        Returns:
+            True if all are valid
+            
+        Raises:
+            HTTPException: For the first invalid file, in upload order
+        """
+        results = await asyncio.gather(
+            *(cls.validate_audio_file(file) for file in files),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
         return True
     
     @classmethod
@@ -136,7 +187,7 @@ class InputValidator:
         
         # Read first chunk to check file signature
         original_position = file.file.tell() if hasattr(file.file, 'tell') else 0
-        content = await file.read(8192)
+        content = cls._read_signature_bytes(file)
         
         # Reset file pointer to original position
         if hasattr(file.file, 'seek'):
@@ -151,79 +202,79 @@ class InputValidator:
                 detail=f"File does not match declared format: {ext}"
             )
         
-        logger.info(f"Video file validated: {filename} ({ext})")
+        logger.info("Video file validated: %s (%s)", filename, ext)
         return True
     
+    @classmethod
+    def _read_signature_bytes(cls, file: UploadFile) -> bytes:
+        """
+        Read the header bytes scanned by the signature checks
+        The spooled upload file is read directly, skipping UploadFile.read's
+        async hop for a read this small; the caller restores the position
+        
+        Args:
+            file: Uploaded file
+            
+        Returns:
+            Up to SIGNATURE_SCAN_SIZE bytes from the current position
+        """
+        return file.file.read(cls.SIGNATURE_SCAN_SIZE)
+    
     @classmethod
     def _check_audio_signature(cls, content: bytes, ext: str) -> bool:
         """Check if file content matches audio format signature"""
-        logger.debug(f"Checking audio signature for format: {ext}")
-        
         if ext not in cls.AUDIO_SIGNATURES:
-            logger.error(f"No signatures defined for format: {ext}")
+            logger.error("No signatures defined for format: %s", ext)
             return False
         
         # Special handling for MP3 files
         if ext == "mp3":
             return cls._check_mp3_signature(content)
         
-        signatures = cls.AUDIO_SIGNATURES[ext]
-        logger.debug(f"Checking against {len(signatures)} signatures for {ext}")
-        
-        for i, sig in enumerate(signatures):
-            if sig in content[:512]:  # Check first 512 bytes
-                logger.debug(f"Signature {i+1} matched for {ext}: {sig}")
-                return True
-            else:
-                logger.debug(f"Signature {i+1} not found for {ext}: {sig}")
+        match = cls._AUDIO_SIGNATURE_PATTERNS[ext].search(content, 0, cls.SIGNATURE_SCAN_SIZE)
+        if match:
+            logger.debug("Signature matched for %s: %r", ext, match.group())
+            return True
         
-        logger.error(f"No matching signatures found for {ext}")
-        logger.debug(f"File content preview (first 32 bytes): {content[:32]}")
-        logger.debug(f"File content hex: {content[:32].hex()}")
+        logger.error("No matching signatures found for %s", ext)
+        cls._log_header(content)
         return False
     
     @classmethod
     def _check_mp3_signature(cls, content: bytes) -> bool:
         """Special MP3 signature checking with more comprehensive detection"""
-        logger.debug("Performing comprehensive MP3 signature check")
-        
         # Check for ID3 tag at the beginning
         if content.startswith(b"ID3"):
             logger.debug("Found ID3 tag at beginning")
             return True
         
         # Check for MP3 frame sync patterns
-        # MP3 frames start with 11 bits set to 1 (0xFFE or 0xFFF)
-        for i in range(min(512, len(content) - 1)):
-            if i < len(content) - 1:
-                # Check for frame sync pattern
-                if content[i] == 0xFF and (content[i + 1] & 0xE0) == 0xE0:
-                    logger.debug(f"Found MP3 frame sync at position {i}: {content[i:i+2].hex()}")
-                    return True
-        
-        # Check for common MP3 signatures
-        mp3_signatures = [b"\xFF\xFB", b"\xFF\xF3", b"\xFF\xF2", b"\xFF\xFA"]
-        for sig in mp3_signatures:
-            if sig in content[:512]:
-                logger.debug(f"Found MP3 signature: {sig.hex()}")
-                return True
+        # MP3 frames start with 11 bits set to 1 (0xFFE or 0xFFF); the common
+        # MP3 signatures (FFFB, FFF3, FFF2, FFFA) are all sync patterns
+        match = cls._MP3_FRAME_SYNC.search(content, 0, cls.SIGNATURE_SCAN_SIZE)
+        if match:
+            logger.debug("Found MP3 frame sync at position %d", match.start())
+            return True
         
         logger.error("No MP3 signatures found")
-        logger.debug(f"File content preview (first 32 bytes): {content[:32]}")
-        logger.debug(f"File content hex: {content[:32].hex()}")
+        cls._log_header(content)
         return False
     
+    @staticmethod
+    def _log_header(content: bytes):
+        """Log the start of a file that failed signature checks, when DEBUG is enabled"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("File content preview (first 32 bytes): %r", content[:32])
+            logger.debug("File content hex: %s", content[:32].hex())
+    
     @classmethod
     def _check_video_signature(cls, content: bytes, ext: str) -> bool:
         """Check if file content matches video format signature"""
         if ext not in cls.VIDEO_SIGNATURES:
             return False
         
-        signatures = cls.VIDEO_SIGNATURES[ext]
-        for sig in signatures:
-            if sig in content[:512]:  # Check first 512 bytes
-                return True
-        return False
+        # Check the scanned header
+        return cls._VIDEO_SIGNATURE_PATTERNS[ext].search(content, 0, cls.SIGNATURE_SCAN_SIZE) is not None
     
     @classmethod
     def validate_format(cls, format_str: str, format_type: str = "audio") -> bool:
@@ -300,7 +351,7 @@ class InputValidator:
                 detail=f"Start time exceeds audio duration ({duration}s)"
             )
         
-        logger.info(f"Time range validated: {start_time}s - {end_time}s")
+        logger.info("Time range validated: %ss - %ss", start_time, end_time)
         return True
     
     @classmethod
@@ -353,27 +404,23 @@ class InputValidator:
         
         # Remove or replace dangerous characters
         # Keep alphanumeric, dots, dashes, underscores, spaces
-        sanitized = re.sub(r"[^\w\s\-\.]", "_", filename)
+        sanitized = cls._UNSAFE_FILENAME_CHARS.sub("_", filename)
         
         # Remove all whitespace characters (including tabs, newlines, etc.)
         # Replace with single space, then strip
-        sanitized = re.sub(r"\s+", " ", sanitized)
+        sanitized = cls._WHITESPACE_RUN.sub(" ", sanitized)
+        
+        # Collapse '..' patterns (path traversal attempts) in one pass
+        sanitized = cls._DOT_RUN.sub(".", sanitized)
         
         # Remove leading/trailing dots, spaces, and all whitespace
         sanitized = sanitized.strip(". \t\n\r\f\v")
         
-        # Remove any remaining '..' patterns (path traversal attempts)
-        while ".." in sanitized:
-            sanitized = sanitized.replace("..", ".")
-        
-        # Remove leading dots again after '..' removal
-        sanitized = sanitized.lstrip(".")
-        
         # Ensure filename is not empty
         if not sanitized or sanitized.isspace():
             sanitized = "file"
         
-        logger.debug(f"Sanitized filename: {filename} -> {sanitized}")
+        logger.debug("Sanitized filename: %s -> %s", filename, sanitized)
         return sanitized
     
     @classmethod
@@ -407,5 +454,5 @@ class InputValidator:
                 detail=f"Maximum {max_count} files allowed for merging"
             )
         
-        logger.info(f"File count validated: {count} files")
+        logger.info("File count validated: %d files", count)
         return True
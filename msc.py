@@ -1,11 +1,12 @@
 import subprocess
 import json
-import io
+import os
+import tempfile
 import time
 import logging
 import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.exceptions import RequestValidationError
 from pathlib import Path
@@ -15,6 +16,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 # Import audio tools router and error models
 from audio_tools.router import router as audio_router
 from audio_tools.error_models import ErrorResponse, ErrorCode, create_error_response, get_http_status
+from audio_tools.validators import InputValidator
 
 # Set up logging with enhanced configuration for debugging
 logging.basicConfig(
@@ -47,14 +49,13 @@ logger.info("="*50)
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for startup and shutdown events
-    Handles cleanup of old temporary files on startup
+    Starts the background sweeper for old temporary files
     """
-    # Startup: Clean up old temporary files
-    from audio_tools.cleanup import cleanup_old_temp_files
+    # Startup: Sweep old temporary files off the request path
+    from audio_tools.cleanup import cleanup_manager
     
-    logger.info("Running startup cleanup of old temporary files")
-    cleanup_old_temp_files(max_age_hours=1)
-    logger.info("Startup cleanup complete")
+    logger.info("Starting background cleanup of old temporary files")
+    cleanup_manager.start_background_sweeper(interval_sec=600, max_age_hours=1)
     
     yield
     
@@ -192,12 +193,105 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     self.active_requests -= 1
 
 
+# Upload size middleware
+# Requirements: 6.2 - Enforce the 100MB limit while the body streams in
+class UploadSizeLimitMiddleware:
+    """
+    Middleware to cap request body size as it is received
+    A declared Content-Length over the cap is rejected before any body is
+    read; otherwise the request fails as soon as the received bytes cross
+    it, so an oversized upload is never spooled in full
+    Pure ASGI (not BaseHTTPMiddleware) so it can wrap the receive channel
+    """
+    
+    # Room for multipart boundaries, part headers and form fields
+    FORM_OVERHEAD = 1024 * 1024
+    
+    def __init__(self, app, max_file_size: int, max_files: int = 10, multi_file_paths: tuple = ("/api/merge",)):
+        """
+        Initialize upload size middleware
+        
+        Args:
+            app: ASGI application
+            max_file_size: Maximum size of one uploaded file in bytes
+            max_files: Files accepted by multi-file endpoints
+            multi_file_paths: Paths accepting up to max_files files
+        """
+        self.app = app
+        self.single_limit = max_file_size + self.FORM_OVERHEAD
+        self.multi_limit = max_file_size * max_files + self.FORM_OVERHEAD
+        self.multi_file_paths = frozenset(multi_file_paths)
+    
+    async def __call__(self, scope, receive, send):
+        """
+        Process request with body size enforcement
+        
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        limit = self.multi_limit if scope["path"] in self.multi_file_paths else self.single_limit
+        
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            logger.warning(f"Upload rejected: Content-Length {int(content_length)} > {limit} for {scope['path']}")
+            
+            error_response = create_error_response(
+                code=ErrorCode.FILE_TOO_LARGE,
+                details=f"Request body exceeds {limit} bytes"
+            )
+            
+            response = JSONResponse(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                content=error_response.model_dump()
+            )
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        exceeded = False
+        
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if exceeded:
+                # Already rejected: later readers (disconnect watchers) get
+                # the remaining messages, which are dropped, not buffered
+                return message
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    logger.warning(f"Upload aborted: body exceeded {limit} bytes for {scope['path']}")
+                    # HTTPException passes through FastAPI's body parsing unchanged
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="File exceeds 100MB limit"
+                    )
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
 # Add timeout middleware (5 minutes for processing operations)
 app.add_middleware(TimeoutMiddleware, timeout_seconds=300)
 
 # Add rate limiting middleware (10 concurrent requests)
 app.add_middleware(RateLimitMiddleware, max_concurrent=10)
 
+# Add upload size middleware
+# Added last, so it runs outside timeout and rate limiting (intended): a
+# request whose Content-Length is over the limit is refused before it takes
+# a concurrency slot or counts against the limit, as it costs no body read.
+# Bodies without a Content-Length are only cut off while being read, which
+# happens in the endpoint, so those are rate limited and timed like any other
+app.add_middleware(UploadSizeLimitMiddleware, max_file_size=InputValidator.MAX_FILE_SIZE)
+
 # CORS middleware configuration
 # Requirements: 9.5, 11.3
 app.add_middleware(
@@ -291,108 +385,205 @@ ffmpeg_path = "ffmpeg"
 # Custom User-Agent string to mimic a browser request
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+# Read size for streaming download output
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+async def _spawn(command, stdin=None, stdout=asyncio.subprocess.PIPE):
+    """
+    Start one stage of a download pipeline
+    stderr is drained in the background so a chatty process never blocks on it
+    
+    Args:
+        command: Command line to run
+        stdin: Input pipe or file descriptor (default: none)
+        stdout: Output pipe or file descriptor (default: a new pipe)
+        
+    Returns:
+        (command, process, stderr_read) stage tuple
+    """
+    process = await asyncio.create_subprocess_exec(
+        *command, stdin=stdin, stdout=stdout, stderr=asyncio.subprocess.PIPE
+    )
+    return command, process, asyncio.ensure_future(process.stderr.read())
+
+
+async def _stream_pipeline(stages):
+    """
+    Start streaming the output of a download pipeline
+    Waits for the first chunk, so a download that fails before producing any
+    audio still ends in an error rather than an empty attachment
+    
+    Args:
+        stages: (command, process, stderr_read) per process, in pipeline order;
+            the stdout of the last one is streamed
+            
+    Returns:
+        Async iterator over the output chunks
+        
+    Raises:
+        subprocess.CalledProcessError: If a stage exits with an error before any output
+    """
+    first_chunk = await stages[-1][1].stdout.read(STREAM_CHUNK_SIZE)
+    if not first_chunk:
+        for stage in stages:
+            await _check_stage(stage)
+    
+    return _stream_chunks(first_chunk, stages)
+
+
+async def _check_stage(stage):
+    """
+    Wait for a pipeline stage to exit
+    
+    Args:
+        stage: (command, process, stderr_read) stage tuple
+        
+    Raises:
+        subprocess.CalledProcessError: If the process exited with an error
+    """
+    command, process, stderr_read = stage
+    returncode = await process.wait()
+    stderr = (await stderr_read).decode(errors="replace")
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
+
+
+async def _wait_readable(fd):
+    """
+    Wait until a pipe has data or is at EOF, without consuming anything
+    
+    Args:
+        fd: Read end of the pipe
+    """
+    loop = asyncio.get_running_loop()
+    readable = loop.create_future()
+    loop.add_reader(fd, lambda: readable.done() or readable.set_result(None))
+    try:
+        await readable
+    finally:
+        loop.remove_reader(fd)
+
+
+async def _stream_chunks(first_chunk, stages):
+    """
+    Yield pipeline output as it arrives, then reap the processes
+    If the client goes away mid-stream, the remaining processes are killed
+    
+    Args:
+        first_chunk: Output already read by _stream_pipeline
+        stages: (command, process, stderr_read) per process, in pipeline order
+    """
+    start_time = time.time()
+    stdout = stages[-1][1].stdout
+    chunk = first_chunk
+    try:
+        while chunk:
+            yield chunk
+            chunk = await stdout.read(STREAM_CHUNK_SIZE)
+    finally:
+        for command, process, stderr_read in stages:
+            if chunk and process.returncode is None:
+                process.kill()
+            returncode = await process.wait()
+            stderr = (await stderr_read).decode(errors="replace")
+            if returncode and not chunk:
+                logger.error(f"{command[0]} exited with {returncode}: {stderr}")
+        logger.info(f"Streaming ran for {time.time() - start_time} seconds.")
+
+
 @app.get("/download-audio/")
 async def download_audio(url: str):
     mainstart = time.time()
     logger.info(f"Downloading audio from: {url}")
 
+    metadata_fd, metadata_path = tempfile.mkstemp(suffix=".json")
+    os.close(metadata_fd)
+    read_fd, write_fd = os.pipe()
+    download = None
+    body = None
     try:
-        # Step 1: Use yt-dlp to get video info and check audio format
-        info_command = [
-            "yt-dlp", "-j", "--skip-download", "--no-check-certificate", "--geo-bypass",
-            "--user-agent", USER_AGENT, url  # Output metadata in JSON format, no SSL check, bypass region block
+        # Step 1: Start a single yt-dlp run; the metadata of the chosen format is
+        # written to metadata_path before the download starts, the audio to the pipe
+        yt_dlp_command = [
+            "yt-dlp",
+            "--format", "bestaudio/best",  # Best available audio
+            "--print-to-file", "before_dl:%(.{ext,acodec,title})j", metadata_path,  # Metadata as JSON
+            "--no-simulate",  # Printing must not turn the run into a dry run
+            "--output", "-",  # Output to stdout (the pipe)
+            "--no-check-certificate",  # Disable certificate check
+            "--geo-bypass",  # Bypass geo-blocks
+            "--user-agent", USER_AGENT,  # Use the browser-like User-Agent
+            url
         ]
-        logger.debug(f"Running command: {' '.join(info_command)}")
-        result = subprocess.run(info_command, capture_output=True, text=True, check=True)
+        logger.debug(f"Running command: {' '.join(yt_dlp_command)}")
+        try:
+            download = await _spawn(yt_dlp_command, stdout=write_fd)
+        finally:
+            os.close(write_fd)
+
+        # The metadata is complete once the first audio byte (or EOF, if yt-dlp failed) arrives
+        await _wait_readable(read_fd)
+        with open(metadata_path) as metadata_file:
+            metadata_line = metadata_file.readline()
+        if not metadata_line:
+            await _check_stage(download)
+            raise ValueError("yt-dlp reported no metadata")
 
         # Parse the JSON output safely
-        metadata = json.loads(result.stdout)  # Parse JSON string to Python dictionary
+        metadata = json.loads(metadata_line)  # Parse JSON string to Python dictionary
 
         ext = metadata.get("ext", "")  # Get the file extension (audio/video format)
+        acodec = metadata.get("acodec") or ""  # Get the audio codec of the chosen format
         title = metadata.get("title", "audio_file")  # Extract the video title or set a default
-        logger.info(f"File extension: {ext}")
+        logger.info(f"File extension: {ext}, audio codec: {acodec}")
         logger.info(f"Title: {title}")
 
-        # Step 2: Handle audio download and conversion
-        if ext == "mp3":
-            # Directly download the MP3 file if it is already in MP3 format
-            yt_dlp_command = [
-                "yt-dlp",
-                "--format", "bestaudio/best",  # Best available audio
-                "--output", "-",  # Output to stdout (in memory)
-                "--no-check-certificate",  # Disable certificate check
-                "--geo-bypass",  # Bypass geo-blocks
-                "--user-agent", USER_AGENT,  # Use the browser-like User-Agent
-                url
+        # Step 2: Handle audio conversion
+        if ext == "mp3" or acodec == "mp3":
+            # Already MP3 (in any container): remux without re-encoding
+            ffmpeg_command = [
+                str(ffmpeg_path), '-i', 'pipe:0',  # Read from stdin
+                '-c:a', 'copy',  # Keep the MP3 stream as is
+                '-f', 'mp3', 'pipe:1'  # Write to stdout
             ]
             logger.info("Downloading MP3")
-            result = subprocess.run(yt_dlp_command, capture_output=True, check=True)
-
-            # Return the result as a streaming response with a dynamic filename
-            logger.debug("Returning MP3 file as response.")
-            return StreamingResponse(io.BytesIO(result.stdout), media_type="audio/mpeg",
-                                     headers={"Content-Disposition": f"attachment; filename={title}.mp3"})
 
         elif ext in ["webm", "m4a", "flac", "ogg"]:
-            # Handle known audio formats that yt-dlp can extract
-            yt_dlp_command = [
-                "yt-dlp",
-                "--extract-audio",  # Extract audio only
-                "--audio-format", "best",  # Let yt-dlp decide the best format
-                "--output", "-",  # Output to stdout (in memory)
-                "--no-check-certificate",  # Disable certificate check
-                "--geo-bypass",  # Bypass geo-blocks
-                "--user-agent", USER_AGENT,  # Use the browser-like User-Agent
-                url
+            # Handle known audio formats by converting them to MP3
+            ffmpeg_command = [
+                str(ffmpeg_path), '-i', 'pipe:0',  # Read from stdin
+                '-c:a', 'libmp3lame', '-b:a', '192k',  # Encode with MP3 codec, 192kbps
+                '-compression_level', '5',  # LAME algorithm quality: faster than its default
+                '-f', 'mp3', 'pipe:1'  # Write to stdout
             ]
-            logger.info(f"Downloading audio in format: {ext}")
-            start_time = time.time()
-            result = subprocess.run(yt_dlp_command, capture_output=True, check=True)
-            end_time = time.time()
-
-            elapsed_time = end_time - start_time
-            logger.info(f"Download ran for {elapsed_time} seconds.")
-
-            # Convert to MP3 if the format isn't MP3
-            if ext != "mp3":
-                ffmpeg_command = [
-                    str(ffmpeg_path), '-i', 'pipe:0',  # Read from stdin
-                    '-c:a', 'libmp3lame', '-b:a', '192k',  # Encode with MP3 codec, 192kbps
-                    '-f', 'mp3', 'pipe:1'  # Write to stdout
-                ]
-                logger.info("Converting to MP3")
-                start_time = time.time()
-                try:
-                    ffmpeg_process = subprocess.Popen(ffmpeg_command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                except Exception as e:
-                    logger.error("Error starting ffmpeg process")
-                    raise e
-
-                try:
-                    mp3_data, stderr = ffmpeg_process.communicate(input=result.stdout)
-                    if stderr:
-                        logger.error(f"FFmpeg stderr: {stderr.decode()}")
-                except Exception as e:
-                    logger.error("Error during ffmpeg communicate")
-                    raise e
-
-                end_time = time.time()
-                elapsed_time = end_time - start_time
-                logger.info(f"Conversion ran for {elapsed_time} seconds.")
-
-                mainend = time.time()
-                main_elapsed_time = mainend - mainstart
-                logger.info(f"Total time: {main_elapsed_time} seconds.")
-
-                # Return the MP3 data as a streaming response with a dynamic filename
-                logger.debug(f"Returning converted MP3 as response.")
-                return StreamingResponse(io.BytesIO(mp3_data), media_type="audio/mpeg",
-                                         headers={"Content-Disposition": f"attachment; filename={title}.mp3"})
+            logger.info(f"Downloading audio in format: {ext} and converting to MP3")
 
         else:
             error_message = f"Unsupported audio format: {ext}"
             logger.error(error_message)
-            return {"error": error_message}
+            error_response = create_error_response(
+                code=ErrorCode.UNSUPPORTED_FORMAT,
+                details=error_message
+            )
+            return JSONResponse(
+                status_code=get_http_status(ErrorCode.UNSUPPORTED_FORMAT),
+                content=error_response.model_dump()
+            )
+
+        # yt-dlp writes straight into ffmpeg's stdin through the pipe,
+        # so the download never passes through this process
+        convert = await _spawn(ffmpeg_command, stdin=read_fd)
+        body = await _stream_pipeline([download, convert])
+
+        mainend = time.time()
+        main_elapsed_time = mainend - mainstart
+        logger.info(f"Time to first byte: {main_elapsed_time} seconds.")
+
+        # Stream the MP3 data as it is produced, with a dynamic filename
+        logger.debug("Returning MP3 as response.")
+        return StreamingResponse(body, media_type="audio/mpeg",
+                                 headers={"Content-Disposition": f"attachment; filename={title}.mp3"})
 
     except subprocess.CalledProcessError as e:
         logger.error(f"yt-dlp subprocess error: {e.stderr}")
@@ -400,6 +591,17 @@ async def download_audio(url: str):
     except Exception as e:
         logger.error(f"General error: {str(e)}")
         return {"error": str(e)}
+    finally:
+        os.close(read_fd)
+        os.remove(metadata_path)
+        # Stop a download whose output is not being streamed, reap it and
+        # drop its stderr drain
+        if body is None and download is not None:
+            _, process, stderr_read = download
+            if process.returncode is None:
+                process.kill()
+            await process.wait()
+            stderr_read.cancel()
 
 
 if __name__ == "__main__":
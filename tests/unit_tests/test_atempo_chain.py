@@ -0,0 +1,44 @@
+"""
+Unit tests for the atempo filter chain used by speed changes.
+Validates that every stage stays in atempo's range and the stages multiply to the speed.
+"""
+
+import math
+
+import pytest
+
+from audio_tools.ffmpeg_wrapper import _atempo_chain
+
+
+def chain_factors(chain: str):
+    """Parse the factors out of an atempo filter chain."""
+    factors = []
+    for stage in chain.split(","):
+        name, value = stage.split("=")
+        assert name == "atempo"
+        factors.append(float(value))
+    return factors
+
+
+class TestAtempoChain:
+    """Test _atempo_chain factoring."""
+    
+    @pytest.mark.parametrize("speed, expected", [
+        (0.25, "atempo=0.5,atempo=0.5"),
+        (3.0, "atempo=2,atempo=1.5"),
+        (4.0, "atempo=2,atempo=2"),
+        (1.5, "atempo=1.5"),
+        (0.5, "atempo=0.5"),
+        (2.0, "atempo=2"),
+    ])
+    def test_chain(self, speed: float, expected: str):
+        """Test the exact chain built for speeds inside and outside 0.5-2.0."""
+        assert _atempo_chain(speed) == expected
+    
+    @pytest.mark.parametrize("speed", [0.1, 0.25, 0.3, 0.75, 1.5, 2.5, 3.0, 3.7, 4.0])
+    def test_factors_in_range_and_multiply_to_speed(self, speed: float):
+        """Test that each stage is within atempo's range and the product is the speed."""
+        factors = chain_factors(_atempo_chain(speed))
+        
+        assert all(0.5 <= factor <= 2.0 for factor in factors)
+        assert math.prod(factors) == pytest.approx(speed, rel=1e-5)
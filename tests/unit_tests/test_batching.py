@@ -0,0 +1,169 @@
+"""
+Unit tests for the FFmpeg request batching scheduler.
+Validates when groups are flushed and the per-input fallback.
+"""
+
+import asyncio
+
+import pytest
+
+from audio_tools.batching import BatchScheduler
+
+
+class GatedRunner:
+    """Runs batch calls inline, optionally holding them until released."""
+    
+    def __init__(self):
+        self.calls = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+    
+    async def __call__(self, func, inputs):
+        self.calls.append(list(inputs))
+        await self.gate.wait()
+        return func(inputs)
+
+
+def upper_batch(inputs):
+    """Batch callable returning each input upper-cased."""
+    return [data.upper() for data in inputs]
+
+
+def failing_batch(inputs):
+    """Batch callable that fails whenever a bad input is present."""
+    if b"bad" in inputs:
+        raise RuntimeError("bad input")
+    return [data.upper() for data in inputs]
+
+
+async def settle():
+    """Let queued tasks and the batch runs they start get going."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def start_blocked_run(scheduler: BatchScheduler, runner: GatedRunner, key="k"):
+    """Start a run that holds its key until the runner's gate is released."""
+    runner.gate.clear()
+    task = asyncio.ensure_future(scheduler.submit(key, b"first", upper_batch))
+    await settle()
+    return task
+
+
+class TestBatchScheduler:
+    """Test batch flushing and failure handling."""
+    
+    @pytest.mark.asyncio
+    async def test_lone_request_runs_without_waiting(self):
+        """Test that a request with nothing running is not held for max_wait."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(max_wait=60, run_blocking=runner)
+        
+        result = await asyncio.wait_for(scheduler.submit("k", b"a", upper_batch), timeout=1)
+        
+        assert result == b"A"
+        assert runner.calls == [[b"a"]]
+    
+    @pytest.mark.asyncio
+    async def test_flush_on_size(self):
+        """Test that a queued group runs as soon as it reaches max_size."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(max_wait=60, max_size=3, run_blocking=runner)
+        first = await start_blocked_run(scheduler, runner)
+        
+        queued = [
+            asyncio.ensure_future(scheduler.submit("k", data, upper_batch))
+            for data in (b"a", b"b", b"c")
+        ]
+        await settle()
+        
+        # The full group started while the first run is still held
+        assert runner.calls == [[b"first"], [b"a", b"b", b"c"]]
+        
+        runner.gate.set()
+        assert await asyncio.gather(first, *queued) == [b"FIRST", b"A", b"B", b"C"]
+    
+    @pytest.mark.asyncio
+    async def test_flush_on_timeout(self):
+        """Test that a queued group runs after max_wait even if the run ahead is still busy."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(max_wait=0.01, max_size=8, run_blocking=runner)
+        first = await start_blocked_run(scheduler, runner)
+        
+        queued = [
+            asyncio.ensure_future(scheduler.submit("k", data, upper_batch))
+            for data in (b"a", b"b")
+        ]
+        await settle()
+        assert runner.calls == [[b"first"]]
+        
+        await asyncio.sleep(0.05)
+        assert runner.calls == [[b"first"], [b"a", b"b"]]
+        
+        runner.gate.set()
+        assert await asyncio.gather(first, *queued) == [b"FIRST", b"A", b"B"]
+    
+    @pytest.mark.asyncio
+    async def test_flush_when_run_ahead_finishes(self):
+        """Test that a queued group starts as soon as the run ahead of it completes."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(max_wait=60, max_size=8, run_blocking=runner)
+        first = await start_blocked_run(scheduler, runner)
+        
+        queued = [
+            asyncio.ensure_future(scheduler.submit("k", data, upper_batch))
+            for data in (b"a", b"b")
+        ]
+        await settle()
+        runner.gate.set()
+        
+        results = await asyncio.wait_for(asyncio.gather(first, *queued), timeout=1)
+        
+        assert results == [b"FIRST", b"A", b"B"]
+        assert runner.calls == [[b"first"], [b"a", b"b"]]
+    
+    @pytest.mark.asyncio
+    async def test_keys_do_not_wait_for_each_other(self):
+        """Test that a run with one key does not hold back requests with another."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(max_wait=60, run_blocking=runner)
+        first = await start_blocked_run(scheduler, runner, key="k")
+        
+        other = asyncio.ensure_future(scheduler.submit("other", b"a", upper_batch))
+        await settle()
+        
+        assert runner.calls == [[b"first"], [b"a"]]
+        
+        runner.gate.set()
+        assert await asyncio.gather(first, other) == [b"FIRST", b"A"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_per_input(self):
+        """Test that a failed batch is retried per input so only the bad one fails."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(max_wait=60, max_size=3, run_blocking=runner)
+        first = await start_blocked_run(scheduler, runner)
+        
+        queued = [
+            asyncio.ensure_future(scheduler.submit("k", data, failing_batch))
+            for data in (b"a", b"bad", b"c")
+        ]
+        await settle()
+        runner.gate.set()
+        results = await asyncio.gather(first, *queued, return_exceptions=True)
+        
+        assert results[:2] == [b"FIRST", b"A"]
+        assert isinstance(results[2], RuntimeError)
+        assert results[3] == b"C"
+        assert runner.calls[1:] == [[b"a", b"bad", b"c"], [b"a"], [b"bad"], [b"c"]]
+    
+    @pytest.mark.asyncio
+    async def test_single_failure_is_not_retried(self):
+        """Test that a lone failing request fails without a second run."""
+        runner = GatedRunner()
+        scheduler = BatchScheduler(run_blocking=runner)
+        
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("k", b"bad", failing_batch)
+        
+        assert runner.calls == [[b"bad"]]
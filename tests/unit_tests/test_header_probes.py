@@ -0,0 +1,212 @@
+"""
+Unit tests for the in-process audio header parsers.
+Validates the fields read from each container and that unusable input
+yields nothing, so callers fall back to ffprobe.
+"""
+
+import struct
+
+import pytest
+
+from audio_tools.ffmpeg_wrapper import _probe_fast
+
+
+def id3v2_tag(body_size: int = 20) -> bytes:
+    """Build an ID3v2.4 tag with an empty body of the given size."""
+    size = bytes((body_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + size + b"\x00" * body_size
+
+
+def mp3_frame(b2: int = 0x90, b3: int = 0x64, body: bytes = b"") -> bytes:
+    """Build an MPEG-1 Layer III frame (default: 128 kbps, 44.1 kHz, joint stereo)."""
+    return b"\xff\xfb" + bytes((b2, b3)) + body + b"\x00" * 64
+
+
+def xing_frame(frames: int, total_bytes: int) -> bytes:
+    """Build a mono 48 kHz first frame carrying a Xing header with frame and byte counts."""
+    side_info = b"\x00" * 17
+    xing = b"Xing" + struct.pack(">III", 0x3, frames, total_bytes)
+    return mp3_frame(b2=0x94, b3=0xC4, body=side_info + xing)
+
+
+def wav_file(extra_chunks: bytes = b"", data_size: int = 176400, declared_size: int = None) -> bytes:
+    """Build a 16-bit stereo 44.1 kHz WAV, with optional chunks before fmt."""
+    fmt = struct.pack("<HHIIHH", 1, 2, 44100, 176400, 4, 16)
+    declared = data_size if declared_size is None else declared_size
+    body = (
+        b"WAVE"
+        + extra_chunks
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", declared) + b"\x00" * data_size
+    )
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def flac_file(sample_rate: int = 44100, total_samples: int = 88200) -> bytes:
+    """Build a FLAC stream header with a single STREAMINFO block."""
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | total_samples
+    streaminfo = (
+        struct.pack(">HH", 4096, 4096)
+        + b"\x00" * 6
+        + packed.to_bytes(8, "big")
+        + b"\x00" * 16
+    )
+    return b"fLaC" + b"\x80" + len(streaminfo).to_bytes(3, "big") + streaminfo
+
+
+def ogg_vorbis_file(sample_rate: int = 44100, nominal_bitrate: int = 128000) -> bytes:
+    """Build the first Ogg page holding a Vorbis identification header."""
+    packet = (
+        b"\x01vorbis"
+        + struct.pack("<IBIiIi", 0, 2, sample_rate, 0, nominal_bitrate, 0)
+        + b"\xb8\x01"
+    )
+    page_header = b"OggS" + b"\x00\x02" + b"\x00" * 20 + bytes((1, len(packet)))
+    return page_header + packet
+
+
+def adts_frame() -> bytes:
+    """Build an AAC-LC ADTS frame header (44.1 kHz, stereo)."""
+    return b"\xff\xf1\x50\x80\x2e\x7f\xfc" + b"\x00" * 32
+
+
+class TestProbeMp3:
+    """Test MP3 frame header parsing."""
+    
+    def test_cbr_frame(self):
+        """Test a bare CBR frame stream."""
+        info = _probe_fast(mp3_frame() * 4, "mp3")
+        
+        assert info == {"sample_rate": 44100, "bit_rate": 128000, "channels": 2, "raw": True}
+    
+    def test_id3v2_tag_is_skipped(self):
+        """Test that the first frame is found after an ID3v2 tag, which makes it not raw."""
+        info = _probe_fast(id3v2_tag() + mp3_frame() * 4, "mp3")
+        
+        assert info == {"sample_rate": 44100, "bit_rate": 128000, "channels": 2, "raw": False}
+    
+    def test_xing_vbr_frame(self):
+        """Test that the Xing frame and byte counts give the average bitrate."""
+        # 1000 frames of 1152 samples at 48 kHz hold 24 s; 288000 bytes is 96 kbps
+        info = _probe_fast(xing_frame(frames=1000, total_bytes=288000) + mp3_frame(), "mp3")
+        
+        assert info == {"sample_rate": 48000, "bit_rate": 96000, "channels": 1, "raw": False}
+    
+    def test_sync_after_junk(self):
+        """Test that false syncs and junk before the first frame are skipped."""
+        info = _probe_fast(b"\x00\xff\x00\xff\xff\x12" + mp3_frame(), "mp3")
+        
+        assert info["sample_rate"] == 44100
+        assert info["raw"] is False
+
+
+class TestProbeWav:
+    """Test RIFF/WAVE header parsing."""
+    
+    def test_plain_wav(self):
+        """Test rate, bitrate and duration from fmt and data."""
+        info = _probe_fast(wav_file(), "wav")
+        
+        assert info == {"sample_rate": 44100, "bit_rate": 1411200, "duration": 1.0}
+    
+    def test_extra_chunks_before_fmt(self):
+        """Test that LIST and odd-sized chunks (with their pad byte) are skipped."""
+        extra = (
+            b"LIST" + struct.pack("<I", 4) + b"INFO"
+            + b"junk" + struct.pack("<I", 3) + b"abc" + b"\x00"
+        )
+        info = _probe_fast(wav_file(extra_chunks=extra), "wav")
+        
+        assert info == {"sample_rate": 44100, "bit_rate": 1411200, "duration": 1.0}
+    
+    def test_streamed_wav_placeholder_size(self):
+        """Test that a placeholder data size falls back to the bytes present."""
+        info = _probe_fast(wav_file(data_size=88200, declared_size=0xFFFFFFFF), "wav")
+        
+        assert info["duration"] == pytest.approx(0.5)
+
+
+class TestProbeFlac:
+    """Test FLAC STREAMINFO parsing."""
+    
+    def test_streaminfo(self):
+        """Test sample rate and duration from the total sample count."""
+        info = _probe_fast(flac_file(), "flac")
+        
+        assert info == {"sample_rate": 44100, "duration": 2.0}
+    
+    def test_unknown_total_samples(self):
+        """Test that a zero sample count leaves the duration out."""
+        info = _probe_fast(flac_file(total_samples=0), "flac")
+        
+        assert info == {"sample_rate": 44100}
+
+
+class TestProbeOgg:
+    """Test Ogg Vorbis identification header parsing."""
+    
+    def test_vorbis_header(self):
+        """Test sample rate and nominal bitrate."""
+        info = _probe_fast(ogg_vorbis_file(), "ogg")
+        
+        assert info == {"sample_rate": 44100, "bit_rate": 128000}
+    
+    def test_no_nominal_bitrate(self):
+        """Test that a zero nominal bitrate is left out."""
+        info = _probe_fast(ogg_vorbis_file(nominal_bitrate=0), "ogg")
+        
+        assert info == {"sample_rate": 44100}
+    
+    def test_non_vorbis_stream(self):
+        """Test that an Opus stream (not parsed) yields nothing."""
+        page = ogg_vorbis_file()
+        opus = page.replace(b"\x01vorbis", b"OpusHea")
+        
+        assert _probe_fast(opus, "ogg") == {}
+
+
+class TestProbeAdts:
+    """Test ADTS frame header parsing."""
+    
+    def test_adts_frame(self):
+        """Test sample rate and channels from the first frame."""
+        info = _probe_fast(adts_frame() * 2, "aac")
+        
+        assert info == {"sample_rate": 44100, "channels": 2, "raw": True}
+    
+    def test_leading_tag(self):
+        """Test that a frame after leading data is found but not raw."""
+        info = _probe_fast(id3v2_tag() + adts_frame(), "aac")
+        
+        assert info == {"sample_rate": 44100, "channels": 2, "raw": False}
+
+
+class TestProbeFallback:
+    """Test that unusable input yields nothing, leaving the work to ffprobe."""
+    
+    @pytest.mark.parametrize("fmt, data", [
+        ("mp3", mp3_frame()[:3]),
+        ("mp3", id3v2_tag(body_size=4096)[:200]),
+        ("wav", wav_file()[:30]),
+        ("wav", b"RIFF\x00\x00\x00\x00WAVE"),
+        ("flac", flac_file()[:20]),
+        ("ogg", ogg_vorbis_file()[:40]),
+        ("aac", adts_frame()[:2]),
+    ])
+    def test_truncated_input(self, fmt: str, data: bytes):
+        """Test headers cut off before the fields are complete."""
+        assert _probe_fast(data, fmt) == {}
+    
+    @pytest.mark.parametrize("fmt", ["mp3", "wav", "flac", "ogg", "aac"])
+    def test_garbage_input(self, fmt: str):
+        """Test data without any recognizable header."""
+        assert _probe_fast(b"\x00\x01garbage\xfe" * 64, fmt) == {}
+    
+    @pytest.mark.parametrize("fmt", ["mp3", "wav", "flac", "ogg", "aac"])
+    def test_empty_input(self, fmt: str):
+        """Test empty data."""
+        assert _probe_fast(b"", fmt) == {}
+    
+    def test_unsupported_format(self):
+        """Test a format without an in-process parser."""
+        assert _probe_fast(wav_file(), "m4a") == {}
@@ -0,0 +1,149 @@
+"""
+Unit tests for custom-segment audio splitting.
+Validates the single-pass segment muxer path and the overlapping-range fallback.
+"""
+
+import io
+import json
+import shutil
+import struct
+import wave
+import zipfile
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from audio_tools.ffmpeg_wrapper import FFmpegWrapper
+from audio_tools.router import router
+
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFmpeg not installed")
+
+SAMPLE_RATE = 44100
+
+# Stream-copy cuts land on packet boundaries, so durations are approximate
+DURATION_TOLERANCE = 0.1
+
+
+def make_wav(seconds: int = 6) -> bytes:
+    """Create a mono WAV whose sample value identifies each second (second k holds k * 1000)."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(b"".join(
+            struct.pack("<h", second * 1000) * SAMPLE_RATE for second in range(seconds)
+        ))
+    return buffer.getvalue()
+
+
+def describe(piece: bytes):
+    """
+    Get the duration of a WAV piece and the second its midpoint comes from.
+    Piped WAV output has no valid size in its header, so the data chunk is read to the end.
+    """
+    data_offset = piece.index(b"data") + 8
+    declared = struct.unpack("<I", piece[data_offset - 4:data_offset])[0]
+    samples = piece[data_offset:data_offset + declared]
+    count = len(samples) // 2
+    middle = struct.unpack_from("<h", samples, (count // 2) * 2)[0]
+    return count / SAMPLE_RATE, middle // 1000
+
+
+@pytest.fixture(scope="module")
+def wav_data() -> bytes:
+    """Create the six-second test input."""
+    return make_wav()
+
+
+@pytest.fixture(scope="module")
+def ffmpeg() -> FFmpegWrapper:
+    """Create FFmpeg wrapper for testing."""
+    return FFmpegWrapper()
+
+
+class TestSplitAudioBySegments:
+    """Test FFmpegWrapper.split_audio_by_segments."""
+    
+    def check_pieces(self, pieces, expected):
+        """Assert piece count, durations and the second each piece was cut from."""
+        assert len(pieces) == len(expected)
+        for piece, (duration, second) in zip(pieces, expected):
+            actual_duration, actual_second = describe(piece)
+            assert actual_duration == pytest.approx(duration, abs=DURATION_TOLERANCE)
+            assert actual_second == second
+    
+    def test_adjacent_segments(self, ffmpeg: FFmpegWrapper, wav_data: bytes):
+        """Test ranges sharing a boundary."""
+        pieces = ffmpeg.split_audio_by_segments(wav_data, "wav", [
+            {"start": 0, "end": 1.5},
+            {"start": 1.5, "end": 3.5},
+        ])
+        
+        self.check_pieces(pieces, [(1.5, 0), (2.0, 2)])
+    
+    def test_gapped_segments(self, ffmpeg: FFmpegWrapper, wav_data: bytes):
+        """Test ranges with gaps before, between and after them."""
+        pieces = ffmpeg.split_audio_by_segments(wav_data, "wav", [
+            {"start": 0.2, "end": 1.6},
+            {"start": 3, "end": 4.5},
+        ])
+        
+        self.check_pieces(pieces, [(1.4, 0), (1.5, 3)])
+    
+    def test_overlapping_segments(self, ffmpeg: FFmpegWrapper, wav_data: bytes):
+        """Test that overlapping ranges each get their full length."""
+        pieces = ffmpeg.split_audio_by_segments(wav_data, "wav", [
+            {"start": 0, "end": 3},
+            {"start": 2, "end": 4.5},
+        ])
+        
+        self.check_pieces(pieces, [(3.0, 1), (2.5, 3)])
+    
+    def test_out_of_order_named_segments(self, ffmpeg: FFmpegWrapper, wav_data: bytes):
+        """Test that pieces come back in the requested order, not time order."""
+        pieces = ffmpeg.split_audio_by_segments(wav_data, "wav", [
+            {"start": 4, "end": 5.5, "name": "chorus"},
+            {"start": 0.5, "end": 2, "name": "intro"},
+        ])
+        
+        self.check_pieces(pieces, [(1.5, 4), (1.5, 1)])
+    
+    def test_empty_segment_is_skipped(self, ffmpeg: FFmpegWrapper, wav_data: bytes):
+        """Test that a range ending before it starts yields no piece."""
+        pieces = ffmpeg.split_audio_by_segments(wav_data, "wav", [
+            {"start": 2, "end": 1},
+            {"start": 2.5, "end": 4},
+        ])
+        
+        self.check_pieces(pieces, [(1.5, 3)])
+
+
+class TestSplitEndpointSegments:
+    """Test the segments mode of the split endpoint."""
+    
+    @pytest.mark.asyncio
+    async def test_zip_entries_follow_requested_order(self):
+        """Test that ZIP entries are numbered in the requested segment order."""
+        app = FastAPI()
+        app.include_router(router)
+        segments = [
+            {"start": 4, "end": 5.5, "name": "chorus"},
+            {"start": 0.5, "end": 2, "name": "intro"},
+        ]
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/split-audio",
+                files={"file": ("song.wav", make_wav(), "audio/wav")},
+                data={"split_mode": "segments", "segments": json.dumps(segments)}
+            )
+        
+        assert response.status_code == 200
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.namelist() == ["segment_1.wav", "segment_2.wav"]
+        assert describe(archive.read("segment_1.wav"))[1] == 4
+        assert describe(archive.read("segment_2.wav"))[1] == 1
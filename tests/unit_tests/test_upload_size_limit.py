@@ -0,0 +1,143 @@
+"""
+Unit tests for the upload size limit middleware.
+Validates the Content-Length check, the streaming check and the merge allowance.
+"""
+
+import httpx
+import pytest
+from fastapi import FastAPI, File, Request, UploadFile
+
+import msc
+from msc import RateLimitMiddleware, TimeoutMiddleware, UploadSizeLimitMiddleware
+
+
+# Per-file limit used by the test app; small so bodies stay tiny
+MAX_FILE_SIZE = 1000
+
+
+class NoOverheadLimit(UploadSizeLimitMiddleware):
+    """Upload limit without the form overhead allowance, so limits are exact."""
+    FORM_OVERHEAD = 0
+
+
+def build_app() -> FastAPI:
+    """Create an app with one single-file and one multi-file endpoint behind the middleware."""
+    app = FastAPI()
+    
+    @app.post("/api/convert")
+    async def convert(request: Request):
+        return {"received": len(await request.body())}
+    
+    @app.post("/api/merge")
+    async def merge(request: Request):
+        return {"received": len(await request.body())}
+    
+    @app.post("/api/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"received": len(await file.read())}
+    
+    app.add_middleware(NoOverheadLimit, max_file_size=MAX_FILE_SIZE)
+    return app
+
+
+def make_client() -> httpx.AsyncClient:
+    """Create an HTTP client for the test app."""
+    transport = httpx.ASGITransport(app=build_app())
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+def chunked(total: int, chunk_size: int = 256):
+    """Yield a body of the given size in chunks, without a Content-Length."""
+    async def body():
+        sent = 0
+        while sent < total:
+            size = min(chunk_size, total - sent)
+            sent += size
+            yield b"x" * size
+    return body()
+
+
+class TestUploadSizeLimit:
+    """Test request body size enforcement."""
+    
+    @pytest.mark.asyncio
+    async def test_body_within_limit_passes(self):
+        """Test that a body at the limit reaches the endpoint."""
+        async with make_client() as client:
+            response = await client.post("/api/convert", content=b"x" * MAX_FILE_SIZE)
+            
+            assert response.status_code == 200
+            assert response.json() == {"received": MAX_FILE_SIZE}
+    
+    @pytest.mark.asyncio
+    async def test_content_length_over_limit_returns_413_json(self):
+        """Test that a declared Content-Length over the limit is refused with the error body."""
+        async with make_client() as client:
+            response = await client.post("/api/convert", content=b"x" * (MAX_FILE_SIZE + 1))
+            
+            assert response.status_code == 413
+            body = response.json()
+            assert body["code"] == "FILE_TOO_LARGE"
+            assert body["error"]
+            assert str(MAX_FILE_SIZE) in body["details"]
+    
+    @pytest.mark.asyncio
+    async def test_chunked_body_over_limit_returns_413(self):
+        """Test that a body without Content-Length is cut off once it crosses the limit."""
+        async with make_client() as client:
+            response = await client.post("/api/convert", content=chunked(MAX_FILE_SIZE * 3))
+            
+            assert response.status_code == 413
+            assert response.json() == {"detail": "File exceeds 100MB limit"}
+    
+    @pytest.mark.asyncio
+    async def test_chunked_multipart_over_limit_returns_413(self):
+        """Test that the streaming limit also applies through multipart form parsing."""
+        async with make_client() as client:
+            boundary = "limit-test"
+            head = (
+                f"--{boundary}\r\n"
+                'Content-Disposition: form-data; name="file"; filename="a.mp3"\r\n'
+                "Content-Type: audio/mpeg\r\n\r\n"
+            ).encode()
+            
+            async def body():
+                yield head
+                async for chunk in chunked(MAX_FILE_SIZE * 3):
+                    yield chunk
+                yield f"\r\n--{boundary}--\r\n".encode()
+            
+            response = await client.post(
+                "/api/upload",
+                content=body(),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+            )
+            
+            assert response.status_code == 413
+    
+    @pytest.mark.asyncio
+    async def test_merge_allows_ten_files(self):
+        """Test that /api/merge accepts up to ten times the single-file limit."""
+        async with make_client() as client:
+            size = MAX_FILE_SIZE * 10
+            
+            response = await client.post("/api/merge", content=b"x" * size)
+            assert response.status_code == 200
+            assert response.json() == {"received": size}
+            
+            response = await client.post("/api/merge", content=chunked(size))
+            assert response.status_code == 200
+            
+            response = await client.post("/api/merge", content=b"x" * (size + 1))
+            assert response.status_code == 413
+            
+            response = await client.post("/api/convert", content=b"x" * size)
+            assert response.status_code == 413
+    
+    def test_runs_outside_timeout_and_rate_limit(self):
+        """Test that the size check wraps the timeout and rate limit middlewares."""
+        # user_middleware lists the outermost middleware first
+        order = [middleware.cls for middleware in msc.app.user_middleware]
+        
+        assert order.index(UploadSizeLimitMiddleware) < order.index(RateLimitMiddleware)
+        assert order.index(UploadSizeLimitMiddleware) < order.index(TimeoutMiddleware)